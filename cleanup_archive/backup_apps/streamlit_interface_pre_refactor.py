@@ -29,6 +29,8 @@ class StreamlitInterface:
         )
         self.load_user_preferences()
         self.setup_session_state()
+        # Holds the reused single-frame figure for this interface
+        self.visualizer = PointCloudVisualizer()
     
     def load_user_preferences(self):
         """Load user preferences from file or set defaults."""
@@ -551,7 +553,7 @@ class StreamlitInterface:
             
             # Show single frame
             bounds = PointCloudVisualizer.calculate_animation_bounds(frames_data)
-            fig = PointCloudVisualizer.create_animation_frame_plot(
+            fig = self.visualizer.create_animation_frame_plot(
                 frames_data[current_frame], current_frame, len(frames_data), bounds
             )
             st.pyplot(fig)
@@ -31,6 +31,7 @@ import time
 import json
 import os
 import glob
+from multiprocessing import shared_memory, resource_tracker
 
 
 def create_sample_data(data_type="sphere", num_points=2000):
@@ -126,6 +127,54 @@ def create_point_cloud(points, colors=None):
     return pcd
 
 
+def _read_shared_arrays(config):
+    """Copy the points/colors arrays listed in a launcher config out of shared memory."""
+    arrays = {}
+    for name in ('points', 'colors'):
+        shm_name = config.get(f'shm_{name}_name')
+        if not shm_name:
+            arrays[name] = None
+            continue
+        
+        shm = shared_memory.SharedMemory(name=shm_name)
+        # The launcher owns the block - stop this process from unlinking it on exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            view = np.ndarray(tuple(config[f'{name}_shape']),
+                              dtype=np.dtype(config[f'{name}_dtype']), buffer=shm.buf)
+            arrays[name] = np.array(view)
+            del view
+        finally:
+            shm.close()
+    
+    colors = arrays['colors']
+    if colors is not None and colors.dtype == np.uint8:
+        arrays['colors'] = colors / 255.0
+    
+    return arrays
+
+
+def load_shared_point_cloud(config_path):
+    """Build a point cloud from arrays shared by the Streamlit launcher."""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    
+    arrays = _read_shared_arrays(config)
+    return create_point_cloud(arrays['points'], arrays['colors'])
+
+
+def load_shared_animation(config):
+    """Split a shared, concatenated animation back into per-frame point clouds."""
+    arrays = _read_shared_arrays(config)
+    offsets = config['offsets']
+    
+    frames = []
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        colors = arrays['colors'][start:end] if arrays['colors'] is not None else None
+        frames.append(create_point_cloud(arrays['points'][start:end], colors))
+    return frames
+
+
 def interactive_controls(vis):
     """Handle interactive controls via terminal input."""
     bg_colors = [
@@ -182,18 +231,25 @@ def interactive_controls(vis):
             break
 
 
-def main():
-    """Main interactive viewer."""
+def main(argv=None):
+    """Main interactive viewer.
+    
+    ``argv`` lets the Streamlit launcher run the viewer in a child process
+    without going through the command line.
+    """
     parser = argparse.ArgumentParser(description="Interactive Open3D Point Cloud Viewer")
     parser.add_argument("--type", choices=["sphere", "torus", "bunny", "dragon"], 
                        default="torus", help="Type of point cloud to generate")
     parser.add_argument("--points", type=int, default=3000, 
                        help="Number of points to generate")
     parser.add_argument("--file", type=str, help="Load point cloud from file (PLY/PCD/XYZ)")
+    parser.add_argument("--shm", type=str, help="Load point cloud from shared memory config JSON")
+    parser.add_argument("--webrtc", action="store_true",
+                       help="Serve the viewer over WebRTC (http://localhost:8888) instead of a window")
     parser.add_argument("--animation", type=str, help="Load animation config JSON file")
     parser.add_argument("--fps", type=int, default=10, help="Animation FPS")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print("Open3D Interactive Desktop Viewer")
     print("=" * 50)
@@ -206,6 +262,13 @@ def main():
             with open(args.animation, 'r') as f:
                 config = json.load(f)
             
+            # Frames shared in memory by the launcher
+            if config.get('shm_points_name'):
+                frames = load_shared_animation(config)
+                print(f"SUCCESS: Attached to {len(frames)} shared animation frames")
+                run_animation_viewer([], args.fps, frames=frames)
+                return
+            
             frame_paths = config.get('frame_paths', [])
             if not frame_paths:
                 print("ERROR: No frame paths found in animation config")
@@ -220,7 +283,15 @@ def main():
             return
     
     # Single point cloud mode
-    if args.file:
+    if args.shm:
+        print(f"Attaching to shared point cloud: {args.shm}")
+        try:
+            pcd = load_shared_point_cloud(args.shm)
+        except Exception as e:
+            print(f"ERROR: Failed to attach shared memory: {e}")
+            return
+        print(f"SUCCESS: Loaded {len(pcd.points)} points")
+    elif args.file:
         print(f"Loading point cloud from: {args.file}")
         pcd = o3d.io.read_point_cloud(args.file)
         if len(pcd.points) == 0:
@@ -233,6 +304,13 @@ def main():
         pcd = create_point_cloud(points, colors)
         print(f"SUCCESS: Generated {len(pcd.points)} points")
     
+    # Browser mode - Open3D streams the viewport to the Streamlit iframe
+    if args.webrtc:
+        o3d.visualization.webrtc_server.enable_webrtc()
+        print("Serving WebRTC viewer at http://localhost:8888")
+        o3d.visualization.draw(pcd, title="Open3D WebRTC Preview", show_ui=False)
+        return
+    
     # Create visualizer with enhanced settings
     vis = o3d.visualization.Visualizer()
     vis.create_window(window_name=f"Open3D Interactive Viewer - {args.type.title()}", 
@@ -309,29 +387,34 @@ def main():
     print("Viewer closed.")
 
 
-def run_animation_viewer(frame_paths, fps=10):
-    """Run animation viewer with playback controls."""
-    if not frame_paths:
-        print("ERROR: No animation frames provided")
-        return
-    
-    print(f"Starting animation viewer ({len(frame_paths)} frames at {fps} FPS)")
-    
-    # Load all frames
-    frames = []
-    print("Loading animation frames...")
-    for i, path in enumerate(frame_paths):
-        if i % 5 == 0:  # Progress update every 5 frames
-            print(f"   Loading frame {i+1}/{len(frame_paths)}")
+def run_animation_viewer(frame_paths, fps=10, frames=None):
+    """Run animation viewer with playback controls.
+    
+    ``frames`` may hold point clouds that are already loaded (e.g. from
+    shared memory), in which case ``frame_paths`` is not read.
+    """
+    if frames is None:
+        if not frame_paths:
+            print("ERROR: No animation frames provided")
+            return
         
-        try:
-            pcd = o3d.io.read_point_cloud(path)
-            if len(pcd.points) > 0:
-                frames.append(pcd)
-            else:
-                print(f"WARNING: Empty frame: {path}")
-        except Exception as e:
-            print(f"WARNING: Could not load frame {path}: {e}")
+        print(f"Starting animation viewer ({len(frame_paths)} frames at {fps} FPS)")
+        
+        # Load all frames
+        frames = []
+        print("Loading animation frames...")
+        for i, path in enumerate(frame_paths):
+            if i % 5 == 0:  # Progress update every 5 frames
+                print(f"   Loading frame {i+1}/{len(frame_paths)}")
+            
+            try:
+                pcd = o3d.io.read_point_cloud(path)
+                if len(pcd.points) > 0:
+                    frames.append(pcd)
+                else:
+                    print(f"WARNING: Empty frame: {path}")
+            except Exception as e:
+                print(f"WARNING: Could not load frame {path}: {e}")
     
     if not frames:
         print("ERROR: No valid frames loaded")
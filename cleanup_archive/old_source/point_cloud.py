@@ -1,8 +1,31 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import os
+import sys
 import cv2
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# The encoder backends are shared with the app's source/ directory
+_SOURCE_DIR = str(Path(__file__).resolve().parents[2] / "source")
+if _SOURCE_DIR not in sys.path:
+    sys.path.append(_SOURCE_DIR)
+from video_writers import FallbackVideoWriter  # noqa: E402
+
+
+def _pyplot():
+    """Import pyplot and the 3D projection only once frames are drawn."""
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 - registers '3d'
+    return plt
+
+
+def _rotation_kernels():
+    """Return the optional Numba rotation kernels, or None without numba."""
+    try:
+        import rotation_kernels
+    except ImportError:
+        return None
+    return rotation_kernels
 
 
 class PointCloudZoetrope:
@@ -26,7 +49,9 @@ class PointCloudZoetrope:
         y = r * np.sin(theta) * np.sin(phi)
         z = r * np.cos(theta)
         
-        return np.column_stack([x, y, z])
+        # float32 halves what rotation and plotting move; the cloud only
+        # ever feeds matplotlib, never Open3D
+        return np.column_stack([x, y, z]).astype(np.float32, copy=False)
     
     def rotate_y(self, angle_degrees):
         """Rotate points around Y-axis by specified angle."""
@@ -35,19 +60,74 @@ class PointCloudZoetrope:
             [np.cos(angle_rad), 0, np.sin(angle_rad)],
             [0, 1, 0],
             [-np.sin(angle_rad), 0, np.cos(angle_rad)]
-        ])
+        ], dtype=self.points.dtype)
         return np.dot(self.points, rotation_matrix.T)
     
+    def _rotate_frame(self, angle_degrees):
+        """Rotate points for one frame, returning (points, depth).
+        
+        With numba available the rotation and depth extraction run as one
+        fused kernel into buffers kept on the cloud, so the result is only
+        valid until the next call.
+        """
+        kernels = _rotation_kernels()
+        if kernels is None:
+            rotated_points = self.rotate_y(angle_degrees)
+            return rotated_points, rotated_points[:, 2]
+        
+        if getattr(self, '_rotation_buffers', None) is None or \
+                len(self._rotation_buffers[1]) != len(self.points):
+            self._rotation_buffers = (np.empty_like(self.points),
+                                      np.empty(len(self.points), dtype=self.points.dtype))
+        out_xyz, out_z = self._rotation_buffers
+        angle_rad = np.radians(angle_degrees)
+        kernels.rotate_y_and_z(np.ascontiguousarray(self.points),
+                               np.cos(angle_rad), np.sin(angle_rad), out_xyz, out_z)
+        return out_xyz, out_z
+    
+    def precompute_rotations(self, angles_degrees):
+        """Rotate points around the Y-axis for every angle in one batch.
+        
+        Stores the (F, N, 3) result as self.rotated and returns it; frame i
+        matches rotate_y(angles_degrees[i]). With numba available each frame
+        is written in place by the fused rotation kernel, otherwise an
+        (F, 3, 3) stack of rotation matrices is applied with one einsum.
+        """
+        angles_rad = np.radians(np.asarray(angles_degrees, dtype=float))
+        c, s = np.cos(angles_rad), np.sin(angles_rad)
+        
+        kernels = _rotation_kernels()
+        if kernels is not None:
+            points = np.ascontiguousarray(self.points)
+            self.rotated = np.empty((len(angles_rad),) + points.shape, dtype=points.dtype)
+            # Workers read depth from rotated[..., 2], so the kernel's depth
+            # output only needs one scratch row
+            depth = np.empty(len(points), dtype=points.dtype)
+            for frame, cos_a, sin_a in zip(self.rotated, c, s):
+                kernels.rotate_y_and_z(points, cos_a, sin_a, frame, depth)
+            return self.rotated
+        
+        R = np.zeros((len(angles_rad), 3, 3), dtype=self.points.dtype)
+        R[:, 0, 0] = c
+        R[:, 0, 2] = s
+        R[:, 1, 1] = 1
+        R[:, 2, 0] = -s
+        R[:, 2, 2] = c
+        
+        self.rotated = np.einsum('nj,fkj->fnk', self.points, R)
+        return self.rotated
+    
     def create_frame(self, angle_degrees, figsize=(8, 8)):
         """Create a matplotlib figure of the rotated point cloud."""
+        plt = _pyplot()
         rotated_points = self.rotate_y(angle_degrees)
         
-        fig = plt.figure(figsize=figsize)
+        fig = plt.figure(figsize=figsize, dpi=100)
         ax = fig.add_subplot(111, projection='3d')
         
         # Plot with depth-based coloring
         ax.scatter(rotated_points[:, 0], rotated_points[:, 1], rotated_points[:, 2], 
-                  c=rotated_points[:, 2], cmap='viridis', s=50, alpha=0.7)
+                  c=rotated_points[:, 2], cmap='viridis', s=50, alpha=0.7, rasterized=True)
         
         # Set limits and styling
         max_range = self.radius * 1.2
@@ -60,13 +140,101 @@ class PointCloudZoetrope:
         
         return fig
     
-    def save_frame(self, angle_degrees, filepath):
-        """Save a frame as PNG file."""
-        fig = self.create_frame(angle_degrees)
-        fig.savefig(filepath, dpi=100, bbox_inches='tight', 
-                   facecolor='black', edgecolor='none')
-        plt.close(fig)
+    def _get_figure(self, figsize=(8, 8)):
+        """Build the figure, axes and scatter artist once per cloud.
+        
+        Limits and styling are fixed for the whole rotation, so frames only
+        need to swap the scatter's data, colors and the title text.
+        """
+        plt = _pyplot()
+        if getattr(self, '_figure', None) is None:
+            fig = plt.figure(figsize=figsize, dpi=100, facecolor='black', edgecolor='none')
+            ax = fig.add_subplot(111, projection='3d')
+            scatter = ax.scatter([], [], [], s=50, alpha=0.7, rasterized=True)
+            
+            max_range = self.radius * 1.2
+            ax.set_xlim([-max_range, max_range])
+            ax.set_ylim([-max_range, max_range])
+            ax.set_zlim([-max_range, max_range])
+            title = ax.set_title('')
+            ax.grid(False)
+            ax.set_facecolor('black')
+            self._figure = (fig, scatter, title)
+        return self._figure
+    
+    def save_frame(self, angle_degrees, filepath, rotated_points=None, return_array=False):
+        """Save a frame as PNG file.
+        
+        rotated_points may be passed in from precompute_rotations to skip
+        rotating the cloud again. With return_array the rendered BGR frame
+        is returned alongside the path, so a video can be written without
+        reading the PNG back; a filepath of None skips the PNG entirely.
+        """
+        plt = _pyplot()
+        fig, scatter, title = self._get_figure()
+        if rotated_points is None:
+            rotated_points, depth = self._rotate_frame(angle_degrees)
+        else:
+            depth = rotated_points[:, 2]
+        
+        # Same depth-based coloring as create_frame, normalized per frame
+        span = np.ptp(depth)
+        scatter._offsets3d = (rotated_points[:, 0], rotated_points[:, 1], depth)
+        scatter.set_facecolor(plt.cm.viridis((depth - depth.min()) / span if span else
+                                             np.zeros_like(depth)))
+        title.set_text(f'Point Cloud - Rotation: {angle_degrees:.1f}°')
+        
+        # Render once and encode the canvas buffer directly; every frame
+        # keeps the full figure size, which the video writer requires
+        fig.canvas.draw()
+        frame = cv2.cvtColor(np.asarray(fig.canvas.buffer_rgba()), cv2.COLOR_RGBA2BGR)
+        # Light zlib level: flat plot backgrounds compress well regardless,
+        # and the default level dominates per-frame save time
+        if filepath is not None:
+            cv2.imwrite(filepath, frame, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+        if return_array:
+            return filepath, frame
         return filepath
+    
+    def close(self):
+        """Release the cached frame figure."""
+        plt = _pyplot()
+        if getattr(self, '_figure', None) is not None:
+            plt.close(self._figure[0])
+            self._figure = None
+
+
+_worker_cloud = None
+
+
+def _init_render_worker(points, radius, rotated):
+    """Rebuild the cloud once per worker process.
+    
+    Only the point arrays and radius cross the process boundary, and each
+    worker keeps one cloud so its frame figure is reused across angles.
+    """
+    global _worker_cloud
+    # Workers only write files, so skip any interactive backend
+    _pyplot().switch_backend('Agg')
+    _worker_cloud = PointCloudZoetrope.__new__(PointCloudZoetrope)
+    _worker_cloud.num_points = len(points)
+    _worker_cloud.radius = radius
+    _worker_cloud.points = points
+    _worker_cloud.rotated = rotated
+
+
+def _render_frame(index, angle, filepath, return_array=False):
+    """Render one precomputed frame with this worker's cloud."""
+    return _worker_cloud.save_frame(angle, filepath, _worker_cloud.rotated[index],
+                                    return_array)
+
+
+def _open_video_writer(path, frame_size, fps, rerender):
+    """Writer for path that falls back codec by codec if an encode fails.
+    
+    rerender returns the frames again for the next codec after a failure.
+    """
+    return FallbackVideoWriter(os.path.splitext(path)[0], frame_size, fps, rerender=rerender)
 
 
 class ZoetropeAnimator:
@@ -75,45 +243,113 @@ class ZoetropeAnimator:
     def __init__(self, point_cloud):
         self.point_cloud = point_cloud
     
-    def generate_frames(self, num_frames=36, data_dir="data", progress_callback=None):
-        """Generate all frames for the animation."""
+    def generate_frames(self, num_frames=36, data_dir="data", progress_callback=None,
+                        max_workers=None, return_arrays=False):
+        """Generate all frames for the animation.
+        
+        Frames are rendered in parallel worker processes, since matplotlib
+        rendering is CPU-bound and holds the GIL. With return_arrays the
+        rendered BGR frames are returned as well, as (paths, frames).
+        """
         os.makedirs(data_dir, exist_ok=True)
         
-        frame_paths = []
         angles = np.linspace(0, 360, num_frames, endpoint=False)
+        frame_paths = [os.path.join(data_dir, f"frame_{i:03d}_{angle:.1f}deg.png")
+                       for i, angle in enumerate(angles)]
+        frames = [None] * num_frames
+        for i, result in self._render_frames(angles, frame_paths, return_arrays,
+                                             progress_callback, max_workers):
+            if return_arrays:
+                frames[i] = result[1]
         
-        for i, angle in enumerate(angles):
-            filename = f"frame_{i:03d}_{angle:.1f}deg.png"
-            filepath = os.path.join(data_dir, filename)
-            
-            self.point_cloud.save_frame(angle, filepath)
-            frame_paths.append(filepath)
-            
-            if progress_callback:
-                progress_callback((i + 1) / num_frames, i + 1, num_frames, angle)
-        
+        if return_arrays:
+            return frame_paths, frames
         return frame_paths
     
-    def create_video(self, frame_paths, output_path="data/zoetrope_video.mp4", fps=1):
-        """Create a video from frames."""
-        if not frame_paths:
+    def stream_video(self, num_frames=36, output_path="data/zoetrope_video.mp4", fps=1,
+                     progress_callback=None, max_workers=None):
+        """Render the animation straight into a video, without frame PNGs.
+        
+        Frames are written in angle order as soon as they and every frame
+        before them are done, so at most the out-of-order ones are held.
+        """
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        angles = np.linspace(0, 360, num_frames, endpoint=False)
+        
+        def frames():
+            return self._frames_in_order(angles, progress_callback, max_workers)
+        
+        video = None
+        try:
+            for frame in frames():
+                if video is None:
+                    video = _open_video_writer(output_path, frame.shape[1::-1], fps, frames)
+                video.write(frame)
+        except BaseException:
+            if video is not None:
+                video.close()
+            raise
+        
+        if video is None:
             return None
+        return video.release()
+    
+    def _frames_in_order(self, angles, progress_callback, max_workers):
+        """Yield rendered BGR frames in angle order as the workers finish them."""
+        pending = {}
+        next_index = 0
+        for i, (_, frame) in self._render_frames(angles, [None] * len(angles), True,
+                                                 progress_callback, max_workers):
+            pending[i] = frame
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+    
+    def _render_frames(self, angles, frame_paths, return_arrays, progress_callback,
+                       max_workers):
+        """Yield (index, save_frame result) as worker processes finish frames."""
+        points = self.point_cloud.points
+        radius = self.point_cloud.radius
+        rotated = self.point_cloud.precompute_rotations(angles)
+        num_frames = len(angles)
+        
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                 initializer=_init_render_worker,
+                                 initargs=(points, radius, rotated)) as pool:
+            futures = {pool.submit(_render_frame, i, angle, filepath, return_arrays): i
+                       for i, (angle, filepath) in enumerate(zip(angles, frame_paths))}
+            # Progress counts completed frames
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                yield i, future.result()
+                if progress_callback:
+                    progress_callback(done / num_frames, done, num_frames, angles[i])
+    
+    def create_video(self, frame_paths, output_path="data/zoetrope_video.mp4", fps=1,
+                     frames=None):
+        """Create a video from frames.
         
-        first_frame = cv2.imread(frame_paths[0])
-        if first_frame is None:
+        Pass the BGR frames from generate_frames(return_arrays=True) to
+        write them directly instead of decoding the PNGs again.
+        """
+        if frames is None and not frame_paths:
             return None
-            
-        height, width, layers = first_frame.shape
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        video = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        if frames is not None:
+            frames = list(frames)
         
-        for frame_path in frame_paths:
-            frame = cv2.imread(frame_path)
-            if frame is not None:
-                video.write(frame)
+        def frame_source():
+            source = frames if frames is not None else (cv2.imread(path) for path in frame_paths)
+            return (frame for frame in source if frame is not None)
+        
+        video = None
+        for frame in frame_source():
+            if video is None:
+                video = _open_video_writer(output_path, frame.shape[1::-1], fps, frame_source)
+            video.write(frame)
         
-        video.release()
-        return output_path
+        if video is None:
+            return None
+        return video.release()
 
 
 # Convenience functions
@@ -123,12 +359,23 @@ def create_point_cloud(num_points=100, radius=5):
 
 
 def create_animation(num_points=100, radius=5, num_frames=36, 
-                    data_dir="data", fps=1, progress_callback=None):
-    """Complete workflow to generate a zoetrope animation."""
+                    data_dir="data", fps=1, progress_callback=None, save_frames=True):
+    """Complete workflow to generate a zoetrope animation.
+    
+    With save_frames=False no frame PNGs are written: frames go straight
+    into the video and the returned frame path list is empty.
+    """
     cloud = create_point_cloud(num_points, radius)
     animator = ZoetropeAnimator(cloud)
     
-    frame_paths = animator.generate_frames(num_frames, data_dir, progress_callback)
-    video_path = animator.create_video(frame_paths, f"{data_dir}/zoetrope_video.mp4", fps)
+    if not save_frames:
+        video_path = animator.stream_video(num_frames, f"{data_dir}/zoetrope_video.mp4", fps,
+                                           progress_callback)
+        return [], video_path
+    
+    frame_paths, frames = animator.generate_frames(num_frames, data_dir, progress_callback,
+                                                   return_arrays=True)
+    video_path = animator.create_video(frame_paths, f"{data_dir}/zoetrope_video.mp4", fps,
+                                       frames=frames)
     
     return frame_paths, video_path
\ No newline at end of file
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""rotation_kernels.py
+
+Numba kernels for the zoetrope's per-frame rotation
+===================================================
+
+Optional: only imported when numba is installed. The kernel rotates the
+cloud and extracts the depth key used for coloring in a single parallel
+pass, writing into preallocated buffers that are reused across frames.
+"""
+
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def rotate_y_and_z(points, cos_a, sin_a, out_xyz, out_z):
+    """Fused Y-axis rotation: one pass writes the points and depth key."""
+    for i in prange(points.shape[0]):
+        x = points[i, 0]
+        z = points[i, 2]
+        out_xyz[i, 0] = cos_a * x + sin_a * z
+        out_xyz[i, 1] = points[i, 1]
+        out_xyz[i, 2] = -sin_a * x + cos_a * z
+        out_z[i] = out_xyz[i, 2]
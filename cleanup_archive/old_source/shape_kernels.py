@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""shape_kernels.py
+
+Numba kernels for the launcher's shape generators
+=================================================
+
+Optional: only imported when numba is installed. Each kernel fills the
+preallocated points/colors arrays in a single parallel pass.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def gen_sphere(phi, costheta, u, radius, points, colors):
+    """Fused sphere kernel: one pass writes every point and color."""
+    inv_span = 1.0 / (2*radius)
+    for i in prange(points.shape[0]):
+        r = radius * u[i] ** (1/3)
+        rho = r * np.sqrt(1.0 - costheta[i] * costheta[i])
+        z = r * costheta[i]
+        points[i, 0] = rho * np.cos(phi[i])
+        points[i, 1] = rho * np.sin(phi[i])
+        points[i, 2] = z
+        red = z * inv_span + 0.5
+        colors[i, 0] = red
+        colors[i, 1] = 0.0
+        colors[i, 2] = 1.0 - red
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def gen_torus(u, v, major_r, minor_r, points, colors):
+    """Fused torus kernel: one pass writes every point and color."""
+    for i in prange(points.shape[0]):
+        su, cu = np.sin(u[i]), np.cos(u[i])
+        sv, cv = np.sin(v[i]), np.cos(v[i])
+        ring = major_r + minor_r * cv
+        points[i, 0] = ring * cu
+        points[i, 1] = ring * su
+        points[i, 2] = minor_r * sv
+        colors[i, 0] = (su + 1) * 0.5
+        colors[i, 1] = (cu + 1) * 0.5
+        colors[i, 2] = (sv + 1) * 0.5
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def gen_helix(turns, height, radius, points, colors):
+    """Fused helix kernel: one pass writes every point and color."""
+    n = points.shape[0]
+    t_max = turns * 2*np.pi
+    step = t_max / (n - 1) if n > 1 else 0.0
+    for i in prange(n):
+        t = i * step
+        frac = t / t_max
+        points[i, 0] = radius * np.cos(t)
+        points[i, 1] = radius * np.sin(t)
+        points[i, 2] = height * frac
+        colors[i, 0] = frac
+        colors[i, 1] = 0.5
+        colors[i, 2] = 1.0 - frac
+
+
+# Compile up front (or load from the on-disk cache) so the first
+# Generate click doesn't pay JIT latency
+_warm_pts = np.empty((2, 3), dtype=np.float32)
+_warm_cols = np.empty((2, 3), dtype=np.float32)
+_warm_in = np.zeros(2)
+gen_sphere(_warm_in, _warm_in, _warm_in, 1.0, _warm_pts, _warm_cols)
+gen_torus(_warm_in, _warm_in, 1.0, 0.3, _warm_pts, _warm_cols)
+gen_helix(3, 2.0, 1.0, _warm_pts, _warm_cols)
+del _warm_pts, _warm_cols, _warm_in
@@ -17,25 +17,364 @@ Run: streamlit run source/streamlit_open3d_launcher.py
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import numpy as np
-import open3d as o3d
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import subprocess
+import sys
 import tempfile
 import os
 import json
+import base64
+import hashlib
 from pathlib import Path
-import pandas as pd
-from io import StringIO
+from io import BytesIO, StringIO
+from string import Template
 import time
 import glob
-import cv2
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+try:
+    import orjson  # Optional: faster config serialization
+except ImportError:
+    orjson = None
+
+
+# Client-side animation player: every frame is shipped once and deck.gl
+# loops through them in the browser, so playback costs no Streamlit reruns
+_ANIMATION_PLAYER_HTML = Template("""
+<div id="player" style="position:relative;height:${height}px;background:#000"></div>
+<div style="font-family:sans-serif;font-size:14px;color:#888;margin-top:6px">
+  <button id="toggle">Pause</button> <span id="label"></span>
+</div>
+<script src="https://unpkg.com/deck.gl@^8.9.0/dist.min.js"></script>
+<script>
+const frames = ${frames};
+function decode(b64, Type) {
+  const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+  return new Type(bytes.buffer);
+}
+const data = frames.map(f => ({
+  name: f.name,
+  length: f.length,
+  attributes: {
+    getPosition: {value: decode(f.positions, Float32Array), size: 3},
+    getColor: {value: decode(f.colors, Uint8Array), size: 3}
+  }
+}));
+const viewer = new deck.DeckGL({
+  container: 'player',
+  views: new deck.OrbitView(),
+  initialViewState: ${view_state},
+  controller: true
+});
+let index = 0;
+let timer = null;
+function show(i) {
+  viewer.setProps({layers: [new deck.PointCloudLayer({
+    id: 'frame',
+    data: data[i],
+    pointSize: 2,
+    coordinateSystem: deck.COORDINATE_SYSTEM.CARTESIAN
+  })]});
+  document.getElementById('label').textContent =
+    'Frame ' + (i + 1) + '/' + data.length + ': ' + data[i].name;
+}
+function play() {
+  timer = setInterval(() => { index = (index + 1) % data.length; show(index); }, 1000 / ${fps});
+}
+document.getElementById('toggle').onclick = function () {
+  if (timer) { clearInterval(timer); timer = null; this.textContent = 'Play'; }
+  else { play(); this.textContent = 'Pause'; }
+};
+show(0);
+play();
+</script>
+""")
+
+
+def _read_ply_frame(ply_file):
+    """Read one PLY animation frame into a frame dict.
+    
+    Uses Open3D's tensor IO so frames are kept as float32 arrays rather
+    than copied out of float64 Vector3dVectors.
+    """
+    import open3d as o3d
+    import open3d.core as o3c
+    
+    pcd = o3d.t.io.read_point_cloud(ply_file)
+    points = pcd.point.positions.to(o3c.float32).numpy()
+    colors = None
+    if 'colors' in pcd.point:
+        colors = pcd.point.colors.numpy()
+        if colors.dtype == np.uint8:
+            colors = colors.astype(np.float32) / np.float32(255)
+        else:
+            colors = colors.astype(np.float32, copy=False)
+    
+    return {
+        'points': points,
+        'colors': colors,
+        'filename': os.path.basename(ply_file)
+    }
+
+
+def _write_ply(ply_path, points, colors=None, compute_normals=False):
+    """Write a compressed binary PLY via Open3D's tensor API.
+    
+    Points stay float32 and colors are stored as uint8, so nothing is
+    widened to float64 on the way through pybind.
+    """
+    import open3d as o3d
+    import open3d.core as o3c
+    
+    pcd = o3d.t.geometry.PointCloud(o3c.Tensor(np.ascontiguousarray(points, dtype=np.float32)))
+    if colors is not None:
+        colors_u8 = np.clip(np.asarray(colors) * 255 + 0.5, 0, 255).astype(np.uint8)
+        pcd.point['colors'] = o3c.Tensor(colors_u8)
+    if compute_normals:
+        pcd.estimate_normals(max_nn=10)
+    
+    return o3d.t.io.write_point_cloud(ply_path, pcd, write_ascii=False, compressed=True)
+
+
+def _write_frame(args):
+    """Write one animation frame to PLY (runs in a worker process)."""
+    i, points, colors, temp_dir, compute_normals = args
+    ply_path = os.path.join(temp_dir, f"frame_{i:04d}.ply")
+    _write_ply(ply_path, points, colors, compute_normals)
+    return ply_path
+
+
+def _shape_kernels():
+    """Return the optional Numba shape kernels, or None without numba.
+    
+    Imported on first use rather than at the top of this script, which
+    Streamlit re-executes on every rerun.
+    """
+    try:
+        import shape_kernels
+    except ImportError:
+        return None
+    return shape_kernels
+
+
+_PLY_DTYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8',
+}
+
+
+def _parse_ply_bytes(data):
+    """Decode PLY vertices straight from bytes (no temp file).
+    
+    Handles ascii and binary PLY files whose first element is the vertex
+    list, which covers everything Open3D writes. Raises ValueError for
+    layouts it doesn't understand so callers can fall back to Open3D.
+    """
+    header_end = data.find(b'end_header')
+    if not data.startswith(b'ply') or header_end < 0:
+        raise ValueError("Not a PLY file")
+    body_start = data.index(b'\n', header_end) + 1
+    header = data[:header_end].decode('ascii').splitlines()
+    
+    fmt = None
+    elements = []
+    for line in header:
+        tokens = line.split()
+        if not tokens:
+            continue
+        if tokens[0] == 'format':
+            fmt = tokens[1]
+        elif tokens[0] == 'element':
+            elements.append((tokens[1], int(tokens[2]), []))
+        elif tokens[0] == 'property' and elements:
+            if tokens[1] == 'list':
+                raise ValueError("List properties are not supported")
+            elements[-1][2].append((tokens[2], _PLY_DTYPES[tokens[1]]))
+    
+    if not elements or elements[0][0] != 'vertex':
+        raise ValueError("PLY vertex element must come first")
+    _, count, props = elements[0]
+    names = [name for name, _ in props]
+    
+    if fmt == 'ascii':
+        table = np.loadtxt(BytesIO(data[body_start:]), max_rows=count, ndmin=2)
+        columns = {name: table[:, i] for i, name in enumerate(names)}
+    elif fmt in ('binary_little_endian', 'binary_big_endian'):
+        order = '<' if fmt == 'binary_little_endian' else '>'
+        dtype = np.dtype([(name, order + code) for name, code in props])
+        columns = np.frombuffer(data, dtype=dtype, count=count, offset=body_start)
+    else:
+        raise ValueError(f"Unsupported PLY format: {fmt}")
+    
+    points = np.column_stack([columns['x'], columns['y'], columns['z']]).astype(np.float64)
+    colors = None
+    if all(c in names for c in ('red', 'green', 'blue')):
+        colors = np.column_stack([columns['red'], columns['green'], columns['blue']]).astype(np.float64)
+        if np.dtype(dict(props)['red']).kind in 'iu':
+            colors /= 255.0
+    
+    return points, colors
+
+
+@st.cache_data(show_spinner=False)
+def _animation_bounds(frames_sig, _frames_data):
+    """Axis limits shared by every frame of an animation.
+    
+    Cached on ``frames_sig`` so reruns (auto-play included) reuse them;
+    per-frame reductions avoid stacking the whole animation into one array.
+    """
+    mins = np.min([f['points'].min(axis=0) for f in _frames_data], axis=0)
+    maxs = np.max([f['points'].max(axis=0) for f in _frames_data], axis=0)
+    total = sum(len(f['points']) for f in _frames_data)
+    mid = np.sum([f['points'].sum(axis=0) for f in _frames_data], axis=0) / total
+    
+    # Equal aspect ratio around the mean, with a 10% margin
+    max_range = np.max(maxs - mins) / 2 * 1.1
+    return {
+        'center': (mins + maxs) / 2,
+        'extent': float(np.max(maxs - mins)),
+        'xlim': [mid[0] - max_range, mid[0] + max_range],
+        'ylim': [mid[1] - max_range, mid[1] + max_range],
+        'zlim': [mid[2] - max_range, mid[2] + max_range]
+    }
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _generate_point_cloud(shape_type, num_points, params_tuple, seed):
+    """Generate a shape's points and colors.
+    
+    Cached on the full parameter set; the seeded generator keeps the output
+    deterministic, so a cache hit returns exactly what a fresh run would.
+    """
+    params = dict(params_tuple)
+    rng = np.random.default_rng(seed)
+    
+    # Preallocate outputs; each branch writes its columns in place
+    points = np.empty((num_points, 3), dtype=np.float32)
+    colors = np.empty((num_points, 3), dtype=np.float32)
+    # Shared scratch buffer for trig terms, so no branch allocates temporaries
+    scratch = np.empty(num_points)
+    
+    if shape_type == "Sphere":
+        radius = params.get('radius', 1.0)
+        phi = rng.uniform(0, 2*np.pi, num_points)
+        costheta = rng.uniform(-1, 1, num_points)
+        u = rng.uniform(0, 1, num_points)
+        
+        kernels = _shape_kernels()
+        if kernels is not None:
+            kernels.gen_sphere(phi, costheta, u, radius, points, colors)
+            return points, colors
+        
+        # r = radius * cbrt(u), written over u; sin(arccos(c)) = sqrt(1 - c^2)
+        r = np.cbrt(u, out=u)
+        r *= radius
+        np.multiply(r, costheta, out=points[:, 2])
+        
+        # Planar radius r*sin(theta), computed in costheta's buffer
+        rho = np.multiply(costheta, costheta, out=costheta)
+        np.subtract(1.0, rho, out=rho)
+        np.sqrt(rho, out=rho)
+        rho *= r
+        
+        np.cos(phi, out=scratch)
+        np.multiply(rho, scratch, out=points[:, 0])
+        np.sin(phi, out=scratch)
+        np.multiply(rho, scratch, out=points[:, 1])
+        
+        # Color by height (single affine pass, blue channel mirrors red)
+        inv_span = np.float32(1.0 / (2*radius))
+        np.multiply(points[:, 2], inv_span, out=colors[:, 0])
+        colors[:, 0] += np.float32(0.5)
+        colors[:, 1] = 0.0
+        np.subtract(1.0, colors[:, 0], out=colors[:, 2])
+    
+    elif shape_type == "Torus":
+        major_r = params.get('major_radius', 1.0)
+        minor_r = params.get('minor_radius', 0.3)
+        
+        u = rng.uniform(0, 2*np.pi, num_points)
+        v = rng.uniform(0, 2*np.pi, num_points)
+        
+        kernels = _shape_kernels()
+        if kernels is not None:
+            kernels.gen_torus(u, v, major_r, minor_r, points, colors)
+            return points, colors
+        
+        # ring = major_r + minor_r*cos(v), computed in v's buffer
+        sv = np.sin(v, out=scratch)
+        np.multiply(sv, minor_r, out=points[:, 2])
+        np.add(sv, 1.0, out=colors[:, 2])
+        ring = np.cos(v, out=v)
+        ring *= minor_r
+        ring += major_r
+        
+        # Each trig term of u is evaluated once into the scratch buffer
+        # and consumed by both the point and the color column
+        cu = np.cos(u, out=scratch)
+        np.multiply(ring, cu, out=points[:, 0])
+        np.add(cu, 1.0, out=colors[:, 1])
+        su = np.sin(u, out=scratch)
+        np.multiply(ring, su, out=points[:, 1])
+        np.add(su, 1.0, out=colors[:, 0])
+        colors *= np.float32(0.5)
+    
+    elif shape_type == "Helix":
+        turns = params.get('turns', 3)
+        height = params.get('height', 2.0)
+        radius = params.get('radius', 1.0)
+        
+        kernels = _shape_kernels()
+        if kernels is not None:
+            kernels.gen_helix(turns, height, radius, points, colors)
+            return points, colors
+        
+        t = np.linspace(0, turns * 2*np.pi, num_points)
+        np.cos(t, out=scratch)
+        np.multiply(scratch, radius, out=points[:, 0])
+        np.sin(t, out=scratch)
+        np.multiply(scratch, radius, out=points[:, 1])
+        
+        # Normalized parameter drives both height and color
+        np.multiply(t, 1.0 / (turns * 2*np.pi), out=colors[:, 0])
+        np.multiply(colors[:, 0], height, out=points[:, 2])
+        colors[:, 1] = 0.5
+        np.subtract(1.0, colors[:, 0], out=colors[:, 2])
+    
+    elif shape_type == "Cube":
+        side = params.get('side_length', 2.0)
+        points[:] = rng.uniform(-side/2, side/2, (num_points, 3))
+        
+        # Color by distance from center
+        dist = np.linalg.norm(points, axis=1)
+        inv_max = np.float32(1.0 / dist.max())
+        np.multiply(dist, inv_max, out=colors[:, 0])
+        colors[:, 1] = 0.5
+        np.subtract(1.0, colors[:, 0], out=colors[:, 2])
+    
+    else:  # Random
+        rng.standard_normal(dtype=np.float32, out=points)
+        rng.random(dtype=np.float32, out=colors)
+    
+    return points, colors
 
 
 class Open3DLauncher:
     """Streamlit app that launches desktop Open3D viewers."""
     
+    # Port used by Open3D's WebRTC server for the in-browser preview
+    WEBRTC_PORT = 8888
+    
+    # Above this many points the preview is rasterized server-side
+    RASTER_THRESHOLD = 200_000
+    
+    # Point budget for scatter-based previews; exports always use every point
+    PREVIEW_MAX_POINTS = 50_000
+    
     def __init__(self):
         st.set_page_config(
             page_title="Open3D Desktop Launcher",
@@ -43,83 +382,9 @@ class Open3DLauncher:
             layout="wide"
         )
     
-    def generate_point_cloud(self, shape_type, num_points, **kwargs):
+    def generate_point_cloud(self, shape_type, num_points, seed=0, **kwargs):
         """Generate point cloud data based on parameters."""
-        
-        if shape_type == "Sphere":
-            radius = kwargs.get('radius', 1.0)
-            phi = np.random.uniform(0, 2*np.pi, num_points)
-            costheta = np.random.uniform(-1, 1, num_points)
-            u = np.random.uniform(0, 1, num_points)
-            
-            theta = np.arccos(costheta)
-            r = radius * (u ** (1/3))
-            
-            x = r * np.sin(theta) * np.cos(phi)
-            y = r * np.sin(theta) * np.sin(phi)
-            z = r * np.cos(theta)
-            points = np.column_stack([x, y, z])
-            
-            # Color by height
-            colors = np.column_stack([
-                (z + radius) / (2*radius),
-                np.zeros_like(z),
-                1 - (z + radius) / (2*radius)
-            ])
-            
-        elif shape_type == "Torus":
-            major_r = kwargs.get('major_radius', 1.0)
-            minor_r = kwargs.get('minor_radius', 0.3)
-            
-            u = np.random.uniform(0, 2*np.pi, num_points)
-            v = np.random.uniform(0, 2*np.pi, num_points)
-            
-            x = (major_r + minor_r * np.cos(v)) * np.cos(u)
-            y = (major_r + minor_r * np.cos(v)) * np.sin(u)
-            z = minor_r * np.sin(v)
-            points = np.column_stack([x, y, z])
-            
-            colors = np.column_stack([
-                (np.sin(u) + 1) / 2,
-                (np.cos(u) + 1) / 2,
-                (np.sin(v) + 1) / 2
-            ])
-            
-        elif shape_type == "Helix":
-            turns = kwargs.get('turns', 3)
-            height = kwargs.get('height', 2.0)
-            radius = kwargs.get('radius', 1.0)
-            
-            t = np.linspace(0, turns * 2*np.pi, num_points)
-            x = radius * np.cos(t)
-            y = radius * np.sin(t)
-            z = height * t / (turns * 2*np.pi)
-            points = np.column_stack([x, y, z])
-            
-            colors = np.column_stack([
-                t / (turns * 2*np.pi),
-                0.5 * np.ones_like(t),
-                1 - t / (turns * 2*np.pi)
-            ])
-            
-        elif shape_type == "Cube":
-            side = kwargs.get('side_length', 2.0)
-            points = np.random.uniform(-side/2, side/2, (num_points, 3))
-            
-            # Color by distance from center
-            dist = np.linalg.norm(points, axis=1)
-            max_dist = np.max(dist)
-            colors = np.column_stack([
-                dist / max_dist,
-                0.5 * np.ones_like(dist),
-                1 - dist / max_dist
-            ])
-        
-        else:  # Random
-            points = np.random.randn(num_points, 3)
-            colors = np.random.rand(num_points, 3)
-        
-        return points, colors
+        return _generate_point_cloud(shape_type, num_points, tuple(sorted(kwargs.items())), seed)
     
     def save_config_and_data(self, points, colors, config):
         """Save point cloud data and config for desktop viewer."""
@@ -128,23 +393,22 @@ class Open3DLauncher:
         temp_dir = tempfile.mkdtemp(prefix=f"open3d_{timestamp}_")
         
         try:
-            # Save point cloud
-            pcd = o3d.geometry.PointCloud()
-            pcd.points = o3d.utility.Vector3dVector(points.astype(np.float64))
-            if colors is not None:
-                pcd.colors = o3d.utility.Vector3dVector(colors.astype(np.float64))
-            pcd.estimate_normals()
-            
+            # Save point cloud - the viewer draws points, not lit meshes, so normals are opt-in
             ply_path = os.path.join(temp_dir, f"pointcloud_{timestamp}.ply")
-            success = o3d.io.write_point_cloud(ply_path, pcd)
+            success = _write_ply(ply_path, points, colors, config.get('compute_normals', False))
             
             if not success:
                 raise RuntimeError("Failed to write PLY file")
             
             # Save config
             config_path = os.path.join(temp_dir, f"config_{timestamp}.json")
-            with open(config_path, "w") as f:
-                json.dump(config, f, indent=2)
+            if orjson is not None:
+                Path(config_path).write_bytes(
+                    orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+                )
+            else:
+                with open(config_path, "w") as f:
+                    json.dump(config, f, indent=2)
             
             return ply_path, config_path, temp_dir
             
@@ -158,41 +422,344 @@ class Open3DLauncher:
                 pass
             raise e
     
-    def launch_desktop_viewer(self, ply_path, config):
-        """Launch the desktop Open3D viewer with specified parameters."""
+    def share_config_and_data(self, points, colors, config):
+        """Expose point cloud arrays to the desktop viewer via shared memory.
+        
+        Skips the PLY encode/decode round trip: the viewer attaches to the
+        named blocks listed in the config file. The blocks are kept alive in
+        session state until the viewer that attached to them has exited.
+        """
+        arrays = [('points', points)]
+        if colors is not None:
+            arrays.append(('colors', colors))
+        
+        return self._share_arrays(arrays, dict(config))
+    
+    def share_animation_data(self, frames_data, config):
+        """Expose every animation frame to the desktop viewer in one block.
+        
+        Frames are concatenated into a single points array (plus uint8
+        colors when every frame has them) with an offsets table, replacing
+        one PLY file per frame.
+        """
+        points = np.concatenate([f['points'] for f in frames_data]).astype(np.float32, copy=False)
+        offsets = np.cumsum([0] + [len(f['points']) for f in frames_data])
+        
+        arrays = [('points', points)]
+        if all(f['colors'] is not None for f in frames_data):
+            colors = np.concatenate([f['colors'] for f in frames_data])
+            arrays.append(('colors', (np.clip(colors, 0, 1) * 255).astype(np.uint8)))
+        
+        shm_config = dict(config, type='animation', num_frames=len(frames_data),
+                          offsets=offsets.tolist())
+        config_path, _ = self._share_arrays(arrays, shm_config)
+        return config_path
+    
+    def _share_arrays(self, arrays, shm_config):
+        """Copy named arrays into shared memory and write the config JSON."""
+        self.release_shared_data()
+        
+        timestamp = int(time.time() * 1000)
+        temp_dir = tempfile.mkdtemp(prefix=f"open3d_{timestamp}_")
+        
+        handles = []
         try:
-            # Get current working directory for the script
-            script_path = Path(__file__).parent / "open3d_desktop_viewer.py"
+            for name, array in arrays:
+                array = np.ascontiguousarray(array)
+                shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                handles.append(shm)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+                shm_config[f'shm_{name}_name'] = shm.name
+                shm_config[f'{name}_shape'] = list(array.shape)
+                shm_config[f'{name}_dtype'] = str(array.dtype)
             
-            # Build command
-            cmd = [
-                "python", str(script_path),
-                "--file", ply_path,
-                "--points", str(config.get('num_points', 1000))
-            ]
+            config_path = os.path.join(temp_dir, f"config_{timestamp}.json")
+            with open(config_path, "w") as f:
+                json.dump(shm_config, f, indent=2)
+        except Exception:
+            for shm in handles:
+                shm.close()
+                shm.unlink()
+            raise
+        
+        shares = st.session_state.setdefault('shared_point_data', [])
+        shares.append({'handles': handles, 'consumer': None})
+        return config_path, temp_dir
+    
+    def attach_shared_consumer(self, process):
+        """Keep the most recently shared blocks alive until process exits."""
+        shares = st.session_state.get('shared_point_data')
+        if shares:
+            shares[-1]['consumer'] = process
+    
+    def release_shared_data(self):
+        """Free shared memory blocks from previous launches.
+        
+        Blocks still attached to a running viewer are kept until it exits,
+        so a just-spawned process never finds its data already unlinked.
+        """
+        remaining = []
+        for share in st.session_state.pop('shared_point_data', []):
+            consumer = share['consumer']
+            if consumer is not None and consumer.poll() is None:
+                remaining.append(share)
+                continue
+            for shm in share['handles']:
+                try:
+                    shm.close()
+                    shm.unlink()
+                except FileNotFoundError:
+                    pass
+        st.session_state.shared_point_data = remaining
+    
+    def launch_desktop_viewer(self, ply_path, config, shm_config_path=None):
+        """Launch the desktop Open3D viewer with specified parameters."""
+        try:
+            # Build viewer arguments
+            if shm_config_path:
+                source_args = ["--shm", shm_config_path]
+            else:
+                source_args = ["--file", ply_path]
+            argv = [*source_args, "--points", str(config.get('num_points', 1000))]
             
             # Launch in background
-            if os.name == 'nt':  # Windows
-                subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_CONSOLE)
-            else:  # Unix/Linux/Mac
-                subprocess.Popen(cmd)
-            
+            process = self.spawn_viewer(argv)
+            if shm_config_path:
+                self.attach_shared_consumer(process)
             return True
         except Exception as e:
             st.error(f"Failed to launch desktop viewer: {str(e)}")
             return False
     
+    def spawn_viewer(self, argv):
+        """Run the desktop viewer script in its own process.
+        
+        A real subprocess keeps the viewer's terminal commands working: it
+        gets its own console on Windows and inherits a usable stdin elsewhere.
+        """
+        script_path = Path(__file__).parent / "open3d_desktop_viewer.py"
+        cmd = [sys.executable, str(script_path), *argv]
+        if os.name == 'nt':  # Windows
+            return subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_CONSOLE)
+        return subprocess.Popen(cmd)
+    
+    def launch_webrtc_preview(self, points, colors, config):
+        """Start an Open3D WebRTC render server for the current point cloud.
+        
+        The server runs in the desktop viewer script (separate process) so the
+        Streamlit script never blocks on Open3D's GUI loop. It is restarted
+        only when the point cloud's contents change.
+        """
+        signature = self.cloud_signature(points, colors)
+        if st.session_state.get('webrtc_signature') == signature:
+            return True
+        
+        previous = st.session_state.pop('webrtc_process', None)
+        if previous is not None and previous.poll() is None:
+            previous.terminate()
+        
+        # float32 points are what Open3D consumes without another copy;
+        # 8-bit colors still cut the shared payload
+        preview_points = np.ascontiguousarray(points, dtype=np.float32)
+        preview_colors = None
+        if colors is not None:
+            preview_colors = (np.clip(colors, 0, 1) * 255).astype(np.uint8)
+        
+        try:
+            config_path, _ = self.share_config_and_data(preview_points, preview_colors, config)
+            script_path = Path(__file__).parent / "open3d_desktop_viewer.py"
+            cmd = [sys.executable, str(script_path), "--shm", config_path, "--webrtc"]
+            st.session_state.webrtc_process = subprocess.Popen(cmd)
+            self.attach_shared_consumer(st.session_state.webrtc_process)
+            st.session_state.webrtc_signature = signature
+            return True
+        except Exception as e:
+            st.error(f"Failed to start WebRTC preview: {str(e)}")
+            return False
+    
+    def preview_webrtc(self, points, colors, config):
+        """Embed the GPU-rendered Open3D viewport in the page."""
+        if self.launch_webrtc_preview(points, colors, config):
+            components.iframe(f"http://localhost:{self.WEBRTC_PORT}", height=600)
+    
+    @staticmethod
+    def quantize_colors(colors, levels=6):
+        """Reduce per-point RGB to palette indices (at most levels**3 colors).
+        
+        Returns (indices, ListedColormap) so scatter can take the scalar-mapped
+        path instead of a full (N, 3) RGB array.
+        """
+        from matplotlib.colors import ListedColormap
+        
+        steps = np.rint(np.clip(colors, 0, 1) * (levels - 1)).astype(np.int16)
+        codes = (steps[:, 0] * levels + steps[:, 1]) * levels + steps[:, 2]
+        used, indices = np.unique(codes, return_inverse=True)
+        
+        palette = np.empty((len(used), 3))
+        palette[:, 0] = used // (levels * levels)
+        palette[:, 1] = (used // levels) % levels
+        palette[:, 2] = used % levels
+        palette /= (levels - 1)
+        
+        return indices, ListedColormap(palette)
+    
+    @staticmethod
+    def height_colors(points):
+        """Color by height, same blue -> red ramp as the generated shapes."""
+        z = points[:, 2]
+        span = np.ptp(z)
+        colors = np.zeros((len(points), 3))
+        colors[:, 0] = (z - z.min()) / span if span > 0 else 0.5
+        colors[:, 2] = 1 - colors[:, 0]
+        return colors
+    
+    @staticmethod
+    def rasterize_points(points, colors, elev=20, azim=30, size=800):
+        """Project points to an RGB image, averaging colors per pixel.
+        
+        Cost is one matmul plus bincounts - O(points) with tiny constants and
+        no per-marker drawing, so it stays fast for millions of points.
+        """
+        if colors is None:
+            colors = Open3DLauncher.height_colors(points)
+        
+        e, a = np.radians(elev), np.radians(azim)
+        rot_z = np.array([[np.cos(a), -np.sin(a), 0], [np.sin(a), np.cos(a), 0], [0, 0, 1]])
+        rot_x = np.array([[1, 0, 0], [0, np.cos(e), -np.sin(e)], [0, np.sin(e), np.cos(e)]])
+        projected = (points - points.mean(axis=0)) @ (rot_x @ rot_z).T
+        
+        # Screen x = projected x, screen up = projected z
+        screen = projected[:, [0, 2]]
+        half = np.abs(screen).max() or 1.0
+        pixels = ((screen / half + 1) * 0.5 * (size - 1)).astype(np.intp)
+        flat = (size - 1 - pixels[:, 1]) * size + pixels[:, 0]
+        
+        counts = np.bincount(flat, minlength=size * size)
+        image = np.zeros((size * size, 3))
+        for channel in range(3):
+            image[:, channel] = np.bincount(flat, weights=colors[:, channel], minlength=size * size)
+        hit = counts > 0
+        image[hit] /= counts[hit, None]
+        
+        return (np.clip(image, 0, 1).reshape(size, size, 3) * 255).astype(np.uint8)
+    
+    @staticmethod
+    def build_point_deck(points, colors, center, extent, height=600):
+        """Build a WebGL (deck.gl) point cloud chart with an orbit camera."""
+        import pandas as pd
+        import pydeck as pdk
+        
+        if colors is None:
+            colors = Open3DLauncher.height_colors(points)
+        
+        rgb = (np.clip(colors, 0, 1) * 255).astype(np.uint8)
+        data = pd.DataFrame({
+            'x': points[:, 0], 'y': points[:, 1], 'z': points[:, 2],
+            'r': rgb[:, 0], 'g': rgb[:, 1], 'b': rgb[:, 2]
+        })
+        
+        layer = pdk.Layer(
+            'PointCloudLayer',
+            data=data,
+            get_position='[x, y, z]',
+            get_color='[r, g, b]',
+            point_size=2,
+        )
+        
+        # Fit the cloud to ~80% of the viewport (OrbitView zoom is log2 px/unit)
+        zoom = float(np.log2(height * 0.8 / extent)) if extent > 0 else 0.0
+        view_state = pdk.ViewState(
+            target=[float(c) for c in center],
+            rotation_x=20,
+            rotation_orbit=30,
+            zoom=zoom
+        )
+        
+        return pdk.Deck(
+            layers=[layer],
+            views=[pdk.View(type='OrbitView', controller=True)],
+            initial_view_state=view_state,
+            map_provider=None,
+            height=height
+        )
+    
+    @staticmethod
+    def cloud_signature(points, colors=None):
+        """Identify a point cloud by its contents for session-state caches.
+        
+        id() is no good as a key: CPython reuses it once a previous cloud
+        is garbage collected, so a new cloud could hit the old one's entry.
+        """
+        key = hashlib.blake2b(np.ascontiguousarray(points).tobytes(), digest_size=16)
+        if colors is not None:
+            key.update(np.ascontiguousarray(colors).tobytes())
+        return (points.shape, key.hexdigest())
+    
+    def raster_preview_image(self, points, colors, azim, max_cached=64):
+        """Return a rasterized preview as JPEG bytes, cached across reruns.
+        
+        Images are kept in session state per rotation angle and dropped when
+        the point cloud changes, so revisiting an angle (or any unrelated
+        widget rerun) skips both rasterization and encoding.
+        """
+        from PIL import Image
+        
+        signature = self.cloud_signature(points, colors)
+        cache = st.session_state.get('raster_cache')
+        if cache is None or cache['signature'] != signature:
+            cache = {'signature': signature, 'images': {}}
+            st.session_state.raster_cache = cache
+        
+        images = cache['images']
+        if azim not in images:
+            if len(images) >= max_cached:
+                images.pop(next(iter(images)))
+            buf = BytesIO()
+            Image.fromarray(self.rasterize_points(points, colors, azim=azim)).save(buf, 'JPEG', quality=85)
+            images[azim] = buf.getvalue()
+        return images[azim]
+    
     def preview_plot(self, points, colors=None):
-        """Create matplotlib preview plot."""
+        """Create WebGL preview plot (GPU-rendered in the browser)."""
+        if len(points) > self.RASTER_THRESHOLD:
+            # Too many points to ship to the browser - rasterize instead
+            azim = st.slider("Rotation", 0, 360, 30, key="raster_azimuth")
+            st.image(self.raster_preview_image(points, colors, azim),
+                     caption=f"Rasterized preview ({len(points)} points)")
+            return
+        
+        mins, maxs = points.min(axis=0), points.max(axis=0)
+        deck = self.build_point_deck(points, colors, (mins + maxs) / 2, np.max(maxs - mins))
+        st.pydeck_chart(deck)
+        st.caption(f"Preview ({len(points)} points)")
+    
+    def preview_subset(self, points, colors=None):
+        """Thin a cloud to the preview budget with a fixed stride.
+        
+        Stride slices are views, so this is free and stable across reruns;
+        the full arrays in session state are left untouched.
+        """
+        step = -(-len(points) // self.PREVIEW_MAX_POINTS)
+        if step <= 1:
+            return points, colors
+        return points[::step], (colors[::step] if colors is not None else None)
+    
+    def preview_plot_matplotlib(self, points, colors=None):
+        """Create matplotlib preview plot (fallback renderer)."""
+        import matplotlib.pyplot as plt
+        
         fig = plt.figure(figsize=(10, 8))
         ax = fig.add_subplot(111, projection='3d')
         
-        if colors is not None:
-            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                      c=colors, s=1, alpha=0.7)
+        shown, shown_colors = self.preview_subset(points, colors)
+        if shown_colors is not None:
+            indices, cmap = self.quantize_colors(shown_colors)
+            ax.scatter(shown[:, 0], shown[:, 1], shown[:, 2], 
+                      c=indices, cmap=cmap, vmin=0, vmax=max(cmap.N - 1, 1),
+                      s=1, alpha=0.7)
         else:
-            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                      c=points[:, 2], cmap='viridis', s=1, alpha=0.7)
+            ax.scatter(shown[:, 0], shown[:, 1], shown[:, 2], 
+                      c=shown[:, 2], cmap='viridis', s=1, alpha=0.7)
         
         ax.set_xlabel('X')
         ax.set_ylabel('Y')
@@ -208,59 +775,77 @@ class Open3DLauncher:
         
         st.pyplot(fig)
         plt.close()
+        if len(shown) < len(points):
+            st.caption(f"Showing {len(shown)} of {len(points)} points (preview)")
     
     def load_uploaded_file(self, uploaded_file):
         """Load point cloud from uploaded file."""
         try:
             if uploaded_file.name.endswith('.csv'):
-                content = StringIO(uploaded_file.getvalue().decode('utf-8'))
-                df = pd.read_csv(content)
+                try:
+                    # Numeric X,Y,Z[,R,G,B] - parse straight into an array
+                    table = np.loadtxt(BytesIO(uploaded_file.getvalue()), delimiter=',',
+                                       skiprows=1, dtype=np.float32, ndmin=2)
+                except ValueError:
+                    # Mixed-type columns: let pandas sort them out
+                    import pandas as pd
+                    
+                    content = StringIO(uploaded_file.getvalue().decode('utf-8'))
+                    table = pd.read_csv(content).values
                 
-                if len(df.columns) < 3:
+                if table.shape[1] < 3:
                     st.error("CSV must have at least 3 columns (X, Y, Z)")
                     return None, None
                 
-                points = df.iloc[:, :3].values
+                points = table[:, :3]
                 colors = None
-                if len(df.columns) >= 6:
-                    colors = df.iloc[:, 3:6].values
-                    if np.max(colors) > 1:
-                        colors = colors / 255.0
+                if table.shape[1] >= 6:
+                    # float32 copy of the color columns, rescaled in place if 0-255
+                    colors = table[:, 3:6].astype(np.float32)
+                    if colors.max() > 1.0:
+                        np.multiply(colors, np.float32(1.0 / 255.0), out=colors)
                 
                 return points, colors
             
-            elif uploaded_file.name.endswith(('.ply', '.pcd', '.xyz')):
-                # Create temp file with proper Windows handling
-                temp_fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(uploaded_file.name)[1])
+            elif uploaded_file.name.endswith('.ply'):
+                data = uploaded_file.getvalue()
                 try:
-                    # Write data to temp file
-                    with os.fdopen(temp_fd, 'wb') as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_file.flush()
-                        os.fsync(tmp_file.fileno())  # Force write to disk
-                    
-                    # Now read with Open3D (file is properly closed)
-                    pcd = o3d.io.read_point_cloud(temp_path)
-                    
-                    # Extract data
-                    points = np.asarray(pcd.points)
-                    colors = np.asarray(pcd.colors) if len(pcd.colors) > 0 else None
-                    
-                    return points, colors
-                    
-                finally:
-                    # Clean up temp file
-                    try:
-                        if os.path.exists(temp_path):
-                            os.unlink(temp_path)
-                    except (OSError, PermissionError) as e:
-                        # Log warning but don't fail - temp files will be cleaned up by OS
-                        st.warning(f"Could not clean up temporary file: {e}")
+                    return _parse_ply_bytes(data)
+                except (ValueError, KeyError):
+                    # Unusual layout: let Open3D decode it from disk
+                    return self._read_point_cloud_file(data, '.ply')
+            
+            elif uploaded_file.name.endswith('.xyz'):
+                table = np.loadtxt(BytesIO(uploaded_file.getvalue()), ndmin=2)
+                return table[:, :3], None
+            
+            elif uploaded_file.name.endswith('.pcd'):
+                return self._read_point_cloud_file(uploaded_file.getvalue(), '.pcd')
             
         except Exception as e:
             st.error(f"Error loading file: {str(e)}")
             return None, None
     
+    def _read_point_cloud_file(self, data, suffix):
+        """Read point cloud bytes through Open3D via a short-lived temp file."""
+        import open3d as o3d
+        
+        temp_fd, temp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(temp_fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            
+            pcd = o3d.io.read_point_cloud(temp_path)
+            points = np.asarray(pcd.points)
+            colors = np.asarray(pcd.colors) if len(pcd.colors) > 0 else None
+            return points, colors
+        finally:
+            try:
+                os.unlink(temp_path)
+            except OSError as e:
+                # Log warning but don't fail - temp files will be cleaned up by OS
+                st.warning(f"Could not clean up temporary file: {e}")
+    
     def load_ply_folder(self, folder_path):
         """Load all PLY files from a folder in alphabetical order."""
         try:
@@ -270,36 +855,35 @@ class Open3DLauncher:
                 st.error(f"No PLY files found in {folder_path}")
                 return None
             
-            frames_data = []
-            
             # Progress bar for loading
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            for i, ply_file in enumerate(ply_files):
-                status_text.text(f"Loading frame {i+1}/{len(ply_files)}: {os.path.basename(ply_file)}")
+            # Open3D's reader releases the GIL, so frames decode in parallel
+            loaded = {}
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = {executor.submit(_read_ply_frame, ply_file): ply_file for ply_file in ply_files}
                 
-                try:
-                    pcd = o3d.io.read_point_cloud(ply_file)
-                    points = np.asarray(pcd.points)
-                    colors = np.asarray(pcd.colors) if len(pcd.colors) > 0 else None
+                for done, future in enumerate(as_completed(futures), start=1):
+                    ply_file = futures[future]
+                    status_text.text(f"Loaded frame {done}/{len(ply_files)}: {os.path.basename(ply_file)}")
                     
-                    frames_data.append({
-                        'points': points,
-                        'colors': colors,
-                        'filename': os.path.basename(ply_file)
-                    })
+                    try:
+                        loaded[ply_file] = future.result()
+                    except Exception as e:
+                        st.warning(f"Could not load {ply_file}: {e}")
                     
-                except Exception as e:
-                    st.warning(f"Could not load {ply_file}: {e}")
-                    continue
-                
-                progress_bar.progress((i + 1) / len(ply_files))
+                    progress_bar.progress(done / len(ply_files))
+            
+            # Restore alphabetical frame order
+            frames_data = [loaded[ply_file] for ply_file in ply_files if ply_file in loaded]
             
             progress_bar.empty()
             status_text.empty()
             
             if frames_data:
+                # Computed once here; preview and export read the same limits
+                st.session_state.animation_bounds = self.animation_bounds(frames_data)
                 st.success(f"✅ Loaded {len(frames_data)} frames from {len(ply_files)} PLY files")
                 return frames_data
             else:
@@ -310,158 +894,178 @@ class Open3DLauncher:
             st.error(f"Error loading folder: {e}")
             return None
     
-    def create_animation_preview(self, frames_data, fps=5):
-        """Create animated preview using matplotlib - controls moved to sidebar."""
+    def animation_bounds(self, frames_data):
+        """Return cached axis limits for an animation."""
+        # Filenames, shapes and first points identify a loaded animation cheaply
+        frames_sig = tuple(
+            (f['filename'], f['points'].shape, f['points'][:1].tobytes())
+            for f in frames_data
+        )
+        bounds = st.session_state.get('animation_bounds')
+        if bounds is None or bounds.get('signature') != frames_sig:
+            bounds = dict(_animation_bounds(frames_sig, frames_data), signature=frames_sig)
+        return bounds
+    
+    def create_animation_preview(self, frames_data, frame_idx=0):
+        """Render one animation frame with WebGL - controls live in the sidebar."""
         if not frames_data:
             return
         
-        # This method is no longer used since controls moved to sidebar
-        # Keeping for compatibility but functionality moved to main animation section
-        pass
+        current_frame = frames_data[frame_idx]
+        points = current_frame['points']
+        
+        # Camera fitted to the whole animation so frames don't jump
+        bounds = self.animation_bounds(frames_data)
+        
+        shown, shown_colors = self.preview_subset(points, current_frame['colors'])
+        deck = self.build_point_deck(shown, shown_colors, bounds['center'], bounds['extent'])
+        st.pydeck_chart(deck)
+        st.caption(f"Frame {frame_idx+1}/{len(frames_data)}: {current_frame['filename']} "
+                   f"(showing {len(shown)} of {len(points)} points)")
+    
+    def animation_player(self, frames_data, fps, height=600):
+        """Play the whole animation in the browser with deck.gl.
+        
+        Frames are encoded once (float32 positions, uint8 colors, base64)
+        and looped client-side instead of rerunning the script per frame.
+        """
+        bounds = self.animation_bounds(frames_data)
+        
+        frames = []
+        for frame in frames_data:
+            points, colors = self.preview_subset(frame['points'], frame['colors'])
+            if colors is None:
+                colors = self.height_colors(points)
+            frames.append({
+                'name': frame['filename'],
+                'length': len(points),
+                'positions': base64.b64encode(np.ascontiguousarray(points, dtype=np.float32)).decode('ascii'),
+                'colors': base64.b64encode((np.clip(colors, 0, 1) * 255).astype(np.uint8)).decode('ascii')
+            })
+        
+        extent = bounds['extent']
+        view_state = {
+            'target': [float(c) for c in bounds['center']],
+            'rotationX': 20,
+            'rotationOrbit': 30,
+            'zoom': float(np.log2(height * 0.8 / extent)) if extent > 0 else 0.0
+        }
+        
+        html = _ANIMATION_PLAYER_HTML.substitute(
+            height=height, fps=fps, frames=json.dumps(frames), view_state=json.dumps(view_state)
+        )
+        components.html(html, height=height + 40)
+    
+    def render_video_frames(self, frames_data, bounds):
+        """Yield BGR video frames rendered off-screen on one reused figure."""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import cv2
+        
+        # Single Agg figure/axes for the whole export - only artist data changes
+        fig = Figure(figsize=(12, 9), facecolor='black', dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111, projection='3d', facecolor='black')
+        
+        # Clean styling - NO emoji characters anywhere
+        ax.set_xlabel('X', color='white', fontsize=12)
+        ax.set_ylabel('Y', color='white', fontsize=12)
+        ax.set_zlabel('Z', color='white', fontsize=12)
+        ax.tick_params(colors='white', labelsize=10)
+        ax.set_xlim(bounds['xlim'])
+        ax.set_ylim(bounds['ylim'])
+        ax.set_zlim(bounds['zlim'])
+        
+        first = frames_data[0]['points']
+        scat = ax.scatter(first[:, 0], first[:, 1], first[:, 2], s=3, alpha=0.8,
+                          edgecolors='none', cmap='viridis')
+        title = ax.set_title('', color='white', fontsize=14, pad=20)
+        
+        # Loop body only swaps per-frame data; everything else is set up above
+        n_frames = len(frames_data)
+        for i, frame_data in enumerate(frames_data):
+            points = frame_data['points']
+            colors = frame_data['colors']
+            
+            # Update progress with clean status
+            st.session_state.video_export_status = f"Rendering frame {i+1}/{n_frames} ({(i + 1) / n_frames * 100:.0f}%)"
+            
+            scat._offsets3d = (points[:, 0], points[:, 1], points[:, 2])
+            if colors is not None:
+                scat.set_array(None)
+                scat.set_facecolor(colors)
+            else:
+                scat.set_array(points[:, 2])
+            title.set_text(f'Frame {i+1}/{n_frames} | {len(points)} points')
+            
+            canvas.draw()
+            rgba = np.asarray(canvas.buffer_rgba())
+            yield cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
     
     def export_animation_video(self, frames_data, fps=5):
         """Export animation as MP4 video with prominent progress tracking."""
+        # The encoder backends are shared with the app's source/ directory
+        source_dir = str(Path(__file__).resolve().parents[2] / "source")
+        if source_dir not in sys.path:
+            sys.path.append(source_dir)
+        from video_writers import FallbackVideoWriter
+        
         try:
             # Initialize status
             st.session_state.video_export_complete = False
             st.session_state.video_export_status = "Initializing export..."
             
-            # Create temp directory for frames
+            # Create temp directory for the video file
             temp_dir = tempfile.mkdtemp(prefix="animation_")
             
             # Update status
             st.session_state.video_export_status = f"Preparing to render {len(frames_data)} frames..."
             
-            # Generate frame images with progress tracking
-            frame_paths = []
+            # Equal aspect ratio - same cached limits as the preview
+            bounds = self.animation_bounds(frames_data)
             
-            for i, frame_data in enumerate(frames_data):
-                try:
-                    points = frame_data['points']
-                    colors = frame_data['colors']
-                    
-                    # Update progress with clean status
-                    progress = (i + 1) / len(frames_data)
-                    st.session_state.video_export_status = f"Rendering frame {i+1}/{len(frames_data)} ({progress*100:.0f}%)"
-                    
-                    # Create matplotlib figure - completely emoji-free
-                    fig = plt.figure(figsize=(12, 9), facecolor='black', dpi=100)
-                    ax = fig.add_subplot(111, projection='3d', facecolor='black')
-                    
-                    if colors is not None:
-                        ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                                  c=colors, s=3, alpha=0.8, edgecolors='none')
-                    else:
-                        ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                                  c=points[:, 2], cmap='viridis', s=3, alpha=0.8, edgecolors='none')
-                    
-                    # Clean styling - NO emoji characters anywhere
-                    ax.set_xlabel('X', color='white', fontsize=12)
-                    ax.set_ylabel('Y', color='white', fontsize=12)
-                    ax.set_zlabel('Z', color='white', fontsize=12)
-                    ax.tick_params(colors='white', labelsize=10)
-                    ax.set_title(f'Frame {i+1}/{len(frames_data)} | {len(points)} points', 
-                               color='white', fontsize=14, pad=20)
-                    
-                    # Equal aspect ratio (compute once for efficiency)
-                    if i == 0:
-                        all_points = np.vstack([f['points'] for f in frames_data])
-                        max_range = np.max(np.ptp(all_points, axis=0)) / 2 * 1.1
-                        mid = np.mean(all_points, axis=0)
-                        xlim = [mid[0] - max_range, mid[0] + max_range]
-                        ylim = [mid[1] - max_range, mid[1] + max_range] 
-                        zlim = [mid[2] - max_range, mid[2] + max_range]
-                    
-                    ax.set_xlim(xlim)
-                    ax.set_ylim(ylim)
-                    ax.set_zlim(zlim)
-                    
-                    # Save frame
-                    frame_path = os.path.join(temp_dir, f"frame_{i:04d}.png")
-                    plt.savefig(frame_path, dpi=100, bbox_inches='tight', 
-                              facecolor='black', edgecolor='none', 
-                              format='png')
-                    plt.close()
-                    
-                    # Verify frame was created
-                    if not os.path.exists(frame_path) or os.path.getsize(frame_path) < 1000:
-                        raise ValueError(f"Frame {i+1} failed to render properly")
-                    
-                    frame_paths.append(frame_path)
-                    
-                except Exception as frame_error:
-                    plt.close('all')  # Ensure matplotlib cleanup
-                    st.session_state.video_export_status = f"Error on frame {i+1}: {frame_error}"
-                    return
-            
-            # Update status for video encoding
-            st.session_state.video_export_status = "Encoding video..."
-            
-            # Video creation process
-            first_frame = cv2.imread(frame_paths[0])
-            if first_frame is None:
-                raise ValueError("Could not read first frame image")
+            # 12x9 inches at 100 DPI
+            width, height = 1200, 900
             
-            height, width, layers = first_frame.shape
+            def report(message):
+                st.session_state.video_export_status = message
             
-            # Try multiple codecs
+            # Frames are streamed straight into the writer; a codec that fails
+            # mid-export is replaced and the frames are rendered again into it.
+            # H.264 (yuv420p, even frame size) first: much smaller files than MPEG-4 Part 2
             codecs_to_try = [
-                ('mp4v', '.mp4', 'MP4V Standard'),
-                ('XVID', '.avi', 'XVID AVI'),
-                ('MJPG', '.avi', 'Motion JPEG'),
+                ('avc1', '.mp4'),
+                ('mp4v', '.mp4'),
+                ('XVID', '.avi'),
+                ('MJPG', '.avi'),
             ]
+            video = FallbackVideoWriter(
+                os.path.join(temp_dir, "animation"), (width, height), fps, codecs_to_try, report,
+                rerender=lambda: self.render_video_frames(frames_data, bounds))
+            try:
+                for frame in self.render_video_frames(frames_data, bounds):
+                    video.write(frame)
+            except BaseException:
+                video.close()
+                raise
             
-            video_created = False
-            final_video_path = None
-            
-            for codec, ext, description in codecs_to_try:
-                st.session_state.video_export_status = f"Trying {description}..."
-                
-                try:
-                    test_path = os.path.join(temp_dir, f"animation{ext}")
-                    fourcc = cv2.VideoWriter_fourcc(*codec)
-                    video = cv2.VideoWriter(test_path, fourcc, fps, (width, height))
-                    
-                    if not video.isOpened():
-                        video.release()
-                        continue
-                    
-                    # Write all frames
-                    for j, frame_path in enumerate(frame_paths):
-                        frame = cv2.imread(frame_path)
-                        if frame is not None:
-                            video.write(frame)
-                        else:
-                            video.release()
-                            raise ValueError(f"Could not read frame {j+1}")
-                    
-                    video.release()
-                    
-                    # Verify the video file
-                    if os.path.exists(test_path):
-                        file_size = os.path.getsize(test_path)
-                        if file_size > 5000:
-                            final_video_path = test_path
-                            video_created = True
-                            st.session_state.video_export_status = f"Video ready! ({file_size / (1024*1024):.1f} MB)"
-                            break
-                        
-                except Exception as e:
-                    continue
-            
-            if not video_created:
+            try:
+                final_video_path = video.release()
+            except RuntimeError:
                 st.session_state.video_export_status = "All video codecs failed!"
-                raise RuntimeError("All video codecs failed.")
+                raise
+            file_size = os.path.getsize(final_video_path)
+            st.session_state.video_export_status = f"Video ready! ({file_size / (1024*1024):.1f} MB)"
             
             # Success! Prepare download
             st.session_state.video_export_complete = True
             
+            # Size from the file system; the bytes are only read by the download button
+            video_size = os.path.getsize(final_video_path)
+            if video_size == 0:
+                raise ValueError("Video file is empty")
+            
             with open(final_video_path, "rb") as f:
-                video_data = f.read()
-                
-                if len(video_data) == 0:
-                    raise ValueError("Video file is empty")
-                
                 # Determine file type
                 file_ext = os.path.splitext(final_video_path)[1]
                 mime_type = "video/mp4" if file_ext == '.mp4' else "video/avi"
@@ -474,14 +1078,14 @@ class Open3DLauncher:
                 with col1:
                     st.metric("Frames", f"{len(frames_data)}")
                 with col2:
-                    st.metric("Size", f"{len(video_data) / (1024*1024):.1f} MB")
+                    st.metric("Size", f"{video_size / (1024*1024):.1f} MB")
                 with col3:
                     st.metric("Duration", f"{len(frames_data) / fps:.1f} sec")
                 
                 # Download button
                 if st.download_button(
                     f"Download {file_ext.upper()} Video",
-                    video_data,
+                    f,
                     file_name=filename,
                     mime=mime_type,
                     use_container_width=True,
@@ -495,29 +1099,18 @@ class Open3DLauncher:
             st.error(f"Error creating video: {str(e)}")
             st.info("Try using the Desktop Viewer for better animation performance.")
     
-    def save_animation_data(self, frames_data):
+    def save_animation_data(self, frames_data, config=None):
         """Save all frames for animated desktop viewer."""
+        compute_normals = bool(config and config.get('compute_normals', False))
         timestamp = int(time.time() * 1000)
         temp_dir = tempfile.mkdtemp(prefix=f"animation_{timestamp}_")
         
         try:
-            ply_paths = []
-            
-            for i, frame_data in enumerate(frames_data):
-                points = frame_data['points']
-                colors = frame_data['colors']
-                
-                # Create point cloud
-                pcd = o3d.geometry.PointCloud()
-                pcd.points = o3d.utility.Vector3dVector(points.astype(np.float64))
-                if colors is not None:
-                    pcd.colors = o3d.utility.Vector3dVector(colors.astype(np.float64))
-                pcd.estimate_normals()
-                
-                # Save frame
-                ply_path = os.path.join(temp_dir, f"frame_{i:04d}.ply")
-                o3d.io.write_point_cloud(ply_path, pcd)
-                ply_paths.append(ply_path)
+            # Frames are independent, so build and write them across processes
+            jobs = [(i, f['points'], f['colors'], temp_dir, compute_normals)
+                    for i, f in enumerate(frames_data)]
+            with ProcessPoolExecutor() as executor:
+                ply_paths = list(executor.map(_write_frame, jobs))
             
             # Save animation config
             config = {
@@ -556,6 +1149,18 @@ class Open3DLauncher:
         with st.sidebar:
             st.header("Configuration")
             
+            preview_renderer = st.selectbox(
+                "Preview Renderer",
+                ["WebGL", "Open3D WebRTC", "Matplotlib"],
+                help="WebGL renders in the browser; Open3D WebRTC streams a GPU-rendered viewport into the page"
+            )
+            
+            compute_normals = st.checkbox(
+                "Compute normals (slower)",
+                value=False,
+                help="Estimate normals when saving PLY files - only needed for lit/mesh rendering"
+            )
+            
             # Data source
             data_source = st.selectbox(
                 "Data Source",
@@ -682,15 +1287,24 @@ class Open3DLauncher:
         if 'points' in st.session_state:
             points = st.session_state.points
             colors = st.session_state.colors
-            config = st.session_state.config
+            config = dict(st.session_state.config, compute_normals=compute_normals)
             
             # Two columns: preview and launch
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                st.subheader("Web Preview (Limited)")
-                st.caption("Basic matplotlib preview - the desktop viewer will be MUCH better!")
-                self.preview_plot(points, colors)
+                if preview_renderer == "Open3D WebRTC":
+                    st.subheader("Web Preview (Open3D)")
+                    st.caption("Interactive Open3D viewport streamed over WebRTC")
+                    self.preview_webrtc(points, colors, config)
+                elif preview_renderer == "Matplotlib":
+                    st.subheader("Web Preview (Limited)")
+                    st.caption("Basic matplotlib preview - the desktop viewer will be MUCH better!")
+                    self.preview_plot_matplotlib(points, colors)
+                else:
+                    st.subheader("Web Preview (WebGL)")
+                    st.caption("GPU-rendered in the browser - drag to orbit, scroll to zoom")
+                    self.preview_plot(points, colors)
             
             with col2:
                 st.subheader("Launch Desktop Viewer")
@@ -702,11 +1316,11 @@ class Open3DLauncher:
                 # Big launch button
                 if st.button("Launch Interactive Desktop Viewer", type="primary", use_container_width=True):
                     with st.spinner("Preparing desktop viewer..."):
-                        # Save data temporarily
-                        ply_path, config_path, temp_dir = self.save_config_and_data(points, colors, config)
+                        # Share arrays with the viewer process (no PLY round trip)
+                        config_path, temp_dir = self.share_config_and_data(points, colors, config)
                         
                         # Launch viewer
-                        success = self.launch_desktop_viewer(ply_path, config)
+                        success = self.launch_desktop_viewer(None, config, shm_config_path=config_path)
                         
                         if success:
                             st.success("Desktop viewer launched!")
@@ -719,7 +1333,7 @@ class Open3DLauncher:
                             - **Scroll**: Zoom in/out
                             - **Terminal commands**: Background, screenshots
                             
-                            Data saved to: `{ply_path}`
+                            Config saved to: `{config_path}`
                             """)
                         else:
                             st.error("Failed to launch desktop viewer")
@@ -746,7 +1360,7 @@ python source/open3d_desktop_viewer.py --file pointcloud.ply
         elif 'frames_data' in st.session_state:
             # Animation mode - Controls in left sidebar, visuals in main area
             frames_data = st.session_state.frames_data
-            config = st.session_state.config
+            config = dict(st.session_state.config, compute_normals=compute_normals)
             fps = st.session_state.get('animation_fps', 10)
             
             # Simplified sidebar with only essential controls
@@ -783,14 +1397,16 @@ python source/open3d_desktop_viewer.py --file pointcloud.ply
                 # Secondary actions - simplified
                 if st.button("Desktop Viewer", use_container_width=True):
                     try:
-                        temp_dir, config_path, ply_paths = self.save_animation_data(frames_data)
-                        script_path = Path(__file__).parent / "open3d_desktop_viewer.py"
-                        cmd = ["python", str(script_path), "--animation", config_path, "--fps", str(fps)]
-                        
-                        if os.name == 'nt':
-                            subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_CONSOLE)
-                        else:
-                            subprocess.Popen(cmd)
+                        # One shared block for all frames; PLY files only as a fallback
+                        try:
+                            config_path = self.share_animation_data(frames_data, config)
+                            shared = True
+                        except (OSError, ValueError):
+                            _, config_path, _ = self.save_animation_data(frames_data, config)
+                            shared = False
+                        process = self.spawn_viewer(["--animation", config_path, "--fps", str(fps)])
+                        if shared:
+                            self.attach_shared_consumer(process)
                         
                         st.success("Desktop viewer launched!")
                     except Exception as e:
@@ -833,47 +1449,12 @@ python source/open3d_desktop_viewer.py --file pointcloud.ply
                 
                 st.markdown("---")
             
-            # Create the plot using the frame_idx from sidebar
-            current_frame = frames_data[frame_idx]
-            points = current_frame['points']
-            colors = current_frame['colors']
-            filename = current_frame['filename']
-            
-            fig = plt.figure(figsize=(12, 8))
-            ax = fig.add_subplot(111, projection='3d')
-            
-            if colors is not None:
-                ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                          c=colors, s=1, alpha=0.7)
-            else:
-                ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                          c=points[:, 2], cmap='viridis', s=1, alpha=0.7)
-            
-            ax.set_xlabel('X')
-            ax.set_ylabel('Y')
-            ax.set_zlabel('Z')
-            # Remove emoji from title to fix matplotlib glyph warnings
-            ax.set_title(f'Frame {frame_idx+1}/{len(frames_data)}: {filename}\nAnimation Preview ({len(points)} points)')
-            
-            # Equal aspect ratio
-            all_points = np.vstack([f['points'] for f in frames_data])
-            max_range = np.max(np.ptp(all_points, axis=0)) / 2
-            mid = np.mean(all_points, axis=0)
-            ax.set_xlim(mid[0] - max_range, mid[0] + max_range)
-            ax.set_ylim(mid[1] - max_range, mid[1] + max_range)
-            ax.set_zlim(mid[2] - max_range, mid[2] + max_range)
-            
-            st.pyplot(fig)
-            plt.close()
-            
-            # Auto-play functionality
             if auto_play:
-                if 'animation_frame' not in st.session_state:
-                    st.session_state.animation_frame = 0
-                
-                st.session_state.animation_frame = (st.session_state.animation_frame + 1) % len(frames_data)
-                time.sleep(1.0 / fps)
-                st.rerun()
+                # Browser-side playback - no per-frame reruns
+                self.animation_player(frames_data, fps)
+            else:
+                # Render the frame selected in the sidebar
+                self.create_animation_preview(frames_data, frame_idx)
         
         else:
             # Instructions when no data loaded
@@ -148,67 +148,64 @@ class FileManager:
         print(f"📊 Found {len(feat_indices)} facial landmarks (feat_0 to feat_{max(feat_indices)})")
         print(f"🎯 Z-axis scaling factor: {z_scale}x")
         
+        # Landmarks with all three coordinate columns, in index order
+        landmark_indices = [idx for idx in feat_indices
+                            if all(f'feat_{idx}_{axis}' in columns for axis in 'xyz')]
+        
+        # Stack every frame into one contiguous (frames, landmarks, 3) array;
+        # complete frames are handed out as views instead of per-row copies.
+        # Kept float64, since these points go straight into Open3D.
+        all_points = np.empty((len(df), len(landmark_indices), 3))
+        all_diffs = np.zeros_like(all_points)
+        for axis_idx, axis in enumerate('xyz'):
+            all_points[:, :, axis_idx] = df[[f'feat_{idx}_{axis}' for idx in landmark_indices]].to_numpy(dtype=float)
+            
+            # Movement difference columns; missing columns or values count as no movement
+            for j, idx in enumerate(landmark_indices):
+                diff_col = f'feat_{idx}_{axis}diff'
+                if diff_col in columns:
+                    all_diffs[:, j, axis_idx] = df[diff_col].to_numpy(dtype=float)
+        np.nan_to_num(all_diffs, copy=False, nan=0.0)
+        
+        # Skip invalid points
+        valid = ~np.isnan(all_points).any(axis=2)
+        
+        # Collect original Z values for scaling analysis, then apply Z-axis
+        # scaling for better 3D visualization (Z movement is scaled too)
+        z_values_all = all_points[:, :, 2][valid]
+        all_points[:, :, 2] *= z_scale
+        all_diffs[:, :, 2] *= z_scale
+        
+        timestamps = df['Time (s)'].to_numpy() if 'Time (s)' in columns else df.index
         frames_data = []
-        z_values_all = []  # Collect Z values for scaling analysis
         
-        for row_idx, row in df.iterrows():
-            points = []
-            movement_data = []
-            
-            # Extract x,y,z coordinates and movement data for each feature
-            for feat_idx in feat_indices:
-                x_col = f'feat_{feat_idx}_x'
-                y_col = f'feat_{feat_idx}_y'
-                z_col = f'feat_{feat_idx}_z'
-                
-                # Movement difference columns
-                xdiff_col = f'feat_{feat_idx}_xdiff'
-                ydiff_col = f'feat_{feat_idx}_ydiff'
-                zdiff_col = f'feat_{feat_idx}_zdiff'
-                
-                if x_col in columns and y_col in columns and z_col in columns:
-                    x = row[x_col]
-                    y = row[y_col]
-                    z = row[z_col]
-                    
-                    # Skip invalid points
-                    if pd.notna(x) and pd.notna(y) and pd.notna(z):
-                        # Apply Z-axis scaling for better 3D visualization
-                        z_scaled = z * z_scale
-                        points.append([x, y, z_scaled])
-                        z_values_all.append(z)  # Store original Z for analysis
-                        
-                        # Extract movement data if available
-                        movement = {'xdiff': 0, 'ydiff': 0, 'zdiff': 0}
-                        if xdiff_col in columns and pd.notna(row[xdiff_col]):
-                            movement['xdiff'] = row[xdiff_col]
-                        if ydiff_col in columns and pd.notna(row[ydiff_col]):
-                            movement['ydiff'] = row[ydiff_col]
-                        if zdiff_col in columns and pd.notna(row[zdiff_col]):
-                            movement['zdiff'] = row[zdiff_col] * z_scale  # Scale Z movement too
-                        
-                        movement_data.append(movement)
-            
-            if len(points) > 0:
-                points = np.array(points)
-                
-                # Generate colors based on mode
-                colors = FileManager._generate_facial_colors(points, feat_indices, color_mode, movement_data)
-                
-                # Get timestamp if available
-                timestamp = row.get('Time (s)', row_idx)
-                
-                frames_data.append({
-                    'points': points,
-                    'colors': colors,
-                    'timestamp': timestamp,
-                    'frame_index': row_idx,
-                    'movement_data': movement_data
-                })
+        for row, row_idx in enumerate(df.index):
+            row_valid = valid[row]
+            if row_valid.all():
+                points = all_points[row]
+                diffs = all_diffs[row]
+            elif row_valid.any():
+                points = all_points[row][row_valid]
+                diffs = all_diffs[row][row_valid]
+            else:
+                continue
+            
+            # Per-landmark (xdiff, ydiff, zdiff) rows
+            movement_data = diffs
+            
+            # Generate colors based on mode
+            colors = FileManager._generate_facial_colors(points, feat_indices, color_mode, movement_data)
+            
+            frames_data.append({
+                'points': points,
+                'colors': colors,
+                'timestamp': timestamps[row],
+                'frame_index': row_idx,
+                'movement_data': movement_data
+            })
         
         # Analyze Z-axis scaling results
-        if z_values_all:
-            z_values_all = np.array(z_values_all)
+        if len(z_values_all):
             z_range = np.max(z_values_all) - np.min(z_values_all)
             print(f"📏 Original Z range: {np.min(z_values_all):.4f} to {np.max(z_values_all):.4f} (range: {z_range:.4f})")
             print(f"📏 Scaled Z range: {np.min(z_values_all)*z_scale:.4f} to {np.max(z_values_all)*z_scale:.4f} (range: {z_range*z_scale:.4f})")
@@ -218,24 +215,17 @@ class FileManager:
     
     @staticmethod
     def _generate_facial_colors(points, feat_indices, color_mode='movement', movement_data=None):
-        """Generate colors for facial landmark points."""
+        """Generate colors for facial landmark points.
+        
+        movement_data is an (N, 3) array of per-landmark xdiff/ydiff/zdiff.
+        """
         num_points = len(points)
+        has_movement = movement_data is not None and len(movement_data) > 0
         
-        if color_mode == 'movement' and movement_data:
+        if color_mode == 'movement' and has_movement:
             # Color by movement intensity (cool blue=static, hot red=high movement)
-            movement_intensities = []
-            
-            for move_data in movement_data:
-                # Calculate 3D movement magnitude
-                xdiff = move_data.get('xdiff', 0)
-                ydiff = move_data.get('ydiff', 0)
-                zdiff = move_data.get('zdiff', 0)
-                
-                # Calculate movement magnitude (Euclidean distance)
-                intensity = np.sqrt(xdiff**2 + ydiff**2 + zdiff**2)
-                movement_intensities.append(intensity)
-            
-            movement_intensities = np.array(movement_intensities)
+            # 3D movement magnitude (Euclidean distance) for all landmarks at once
+            movement_intensities = np.linalg.norm(movement_data, axis=1)
             
             # Normalize movement intensities
             if np.max(movement_intensities) > 0:
@@ -302,7 +292,7 @@ class FileManager:
             colors = np.ones((num_points, 3)) * [0.7, 0.7, 0.9]  # Light blue-gray
             
         else:  # Default to movement if data available, otherwise depth
-            if movement_data:
+            if has_movement:
                 colors = FileManager._generate_facial_colors(points, feat_indices, 'movement', movement_data)
             else:
                 colors = FileManager._generate_facial_colors(points, feat_indices, 'depth')
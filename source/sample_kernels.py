@@ -0,0 +1,27 @@
+"""Sample Kernels Module
+
+Numba kernels for the viewer's sample data generator.
+Optional: only imported when numba is installed and the cloud is large
+enough for the compiled pass to beat NumPy.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def gen_sphere(points, colors):
+    """Fused sphere kernel: draws, trig and both outputs in one pass."""
+    for i in prange(points.shape[0]):
+        phi = np.random.uniform(0.0, 2*np.pi)
+        costheta = np.random.uniform(-1.0, 1.0)
+        r = np.random.random() ** (1/3)
+        
+        r_sin_theta = r * np.sqrt(1.0 - costheta * costheta)
+        points[i, 0] = r_sin_theta * np.cos(phi)
+        points[i, 1] = r_sin_theta * np.sin(phi)
+        points[i, 2] = r * costheta
+        
+        colors[i, 0] = phi / (2*np.pi)
+        colors[i, 1] = np.arccos(costheta) / np.pi
+        colors[i, 2] = 0.8
@@ -7,6 +7,7 @@ Three tabs: Import, Animation, Analysis (future)
 import streamlit as st
 import time
 import json
+import re
 import os
 import numpy as np
 import pandas as pd
@@ -17,6 +18,35 @@ from file_manager import FileManager
 from desktop_launcher import DesktopLauncher
 from data_filters import DataFilters
 
+# Landmark coordinate columns: feat_<n>_<axis>
+_COORD_RE = re.compile(r'^feat_.*_([xyz])$')
+
+
+@st.cache_data(show_spinner=False)
+def _classify_cols(cols):
+    """Split landmark columns by axis, cached on the column names.
+    
+    Returns a dict with 'x', 'y', 'z' lists and the combined 'coord' list,
+    all in column order.
+    """
+    # Single pass: one regex match per column fills every group
+    groups = {'x': [], 'y': [], 'z': [], 'coord': []}
+    for col in cols:
+        match = _COORD_RE.match(col)
+        if match:
+            groups[match.group(1)].append(col)
+            groups['coord'].append(col)
+    return groups
+
+
+def _read_landmark_csv(file_path):
+    """Read a landmark CSV and remember its landmark count in df.attrs."""
+    df = pd.read_csv(file_path)
+    # Invariant for the life of the DataFrame; consumers read the attr instead
+    # of rescanning the columns on every rerun
+    df.attrs['num_landmarks'] = len(_classify_cols(tuple(df.columns))['x'])
+    return df
+
 
 class StreamlitInterface:
     """Streamlined Streamlit interface for facial microexpression analysis."""
@@ -60,7 +90,7 @@ class StreamlitInterface:
         st.title("🎭 Facial Microexpression Analysis")
         
         # Determine which tab should be active based on state
-        if hasattr(st.session_state, 'current_experiment') and st.session_state.current_experiment:
+        if st.session_state.get('current_experiment'):
             default_tab = 1  # Animation tab
         else:
             default_tab = 0  # Import tab
@@ -105,7 +135,7 @@ class StreamlitInterface:
         """Load and preview the selected CSV file."""
         try:
             with st.spinner("Loading CSV file..."):
-                df = pd.read_csv(file_path)
+                df = _read_landmark_csv(file_path)
                 
                 # Check if Time (s) column exists and sort by it
                 if 'Time (s)' in df.columns:
@@ -127,9 +157,8 @@ class StreamlitInterface:
             with col2:
                 st.metric("Columns", len(df.columns))
             with col3:
-                # Detect number of landmarks
-                coord_cols = [col for col in df.columns if col.startswith('feat_') and col.endswith(('_x', '_y', '_z'))]
-                num_landmarks = len(coord_cols) // 3
+                # Landmark count was recorded when the CSV was read
+                num_landmarks = df.attrs.get('num_landmarks', 0)
                 st.metric("Facial Landmarks", num_landmarks)
             
             # Preview data
@@ -153,31 +182,21 @@ class StreamlitInterface:
                 if num_landmarks > 0:
                     st.subheader("Landmark Statistics")
                     
-                    # Get coordinate columns
-                    x_cols = [col for col in df.columns if col.startswith('feat_') and col.endswith('_x')]
-                    y_cols = [col for col in df.columns if col.startswith('feat_') and col.endswith('_y')]
-                    z_cols = [col for col in df.columns if col.startswith('feat_') and col.endswith('_z')]
+                    # Get coordinate columns (cached on the column names)
+                    cols = _classify_cols(tuple(df.columns))
+                    x_cols, y_cols, z_cols = cols['x'], cols['y'], cols['z']
                     
                     if x_cols and y_cols and z_cols:
-                        stats_data = {
-                            'Axis': ['X', 'Y', 'Z'],
-                            'Min': [
-                                df[x_cols].min().min(),
-                                df[y_cols].min().min(),
-                                df[z_cols].min().min()
-                            ],
-                            'Max': [
-                                df[x_cols].max().max(),
-                                df[y_cols].max().max(),
-                                df[z_cols].max().max()
-                            ],
-                            'Mean': [
-                                df[x_cols].mean().mean(),
-                                df[y_cols].mean().mean(),
-                                df[z_cols].mean().mean()
-                            ]
-                        }
-                        stats_df = pd.DataFrame(stats_data)
+                        # One NumPy block per axis; NaN-aware like the pandas reductions
+                        X = df[x_cols].to_numpy(copy=False)
+                        Y = df[y_cols].to_numpy(copy=False)
+                        Z = df[z_cols].to_numpy(copy=False)
+                        # Fixed 3x3 table: build it as one float block. Mean is
+                        # the mean of per-column means, as df.mean().mean() gave
+                        stats = np.array([[np.nanmin(A), np.nanmax(A), np.nanmean(np.nanmean(A, axis=0))]
+                                          for A in (X, Y, Z)])
+                        stats_df = pd.DataFrame(stats, columns=['Min', 'Max', 'Mean'])
+                        stats_df.insert(0, 'Axis', ['X', 'Y', 'Z'])
                         st.dataframe(stats_df, use_container_width=True)
             
             # Auto-progress to Animation tab
@@ -190,7 +209,7 @@ class StreamlitInterface:
         """Render the Animation tab for creating and viewing animations."""
         st.header("Create Animation")
         
-        if not hasattr(st.session_state, 'current_experiment'):
+        if 'current_experiment' not in st.session_state:
             st.warning("Please select an experiment in the Import tab first.")
             return
             
@@ -230,7 +249,7 @@ class StreamlitInterface:
                 
                 # Load CSV silently
                 try:
-                    df = pd.read_csv(file_path)
+                    df = _read_landmark_csv(file_path)
                     st.session_state.csv_data = df
                 except Exception as e:
                     st.error(f"Error loading file: {str(e)}")
@@ -253,7 +272,7 @@ class StreamlitInterface:
             st.success("✅ Animation created successfully!\n\nThe interactive 3D viewer has been launched in a separate window.")
             
             # Check if we need to launch the viewer
-            if hasattr(st.session_state, 'launch_viewer_pending') and st.session_state.launch_viewer_pending:
+            if st.session_state.get('launch_viewer_pending'):
                 st.session_state.launch_viewer_pending = False
                 
                 # Capture data before thread
@@ -278,7 +297,7 @@ class StreamlitInterface:
                 st.info("Select a test above to begin.")
         
         # Settings footer (expandable) - always at the bottom
-        if hasattr(st.session_state, 'current_experiment'):
+        if 'current_experiment' in st.session_state:
             with st.expander("⚙️ Advanced Settings", expanded=False):
                 col1, col2 = st.columns(2)
                 with col1:
@@ -314,9 +333,10 @@ class StreamlitInterface:
                 df = st.session_state.csv_data
                 
                 # Get coordinate columns
-                x_cols = sorted([col for col in df.columns if col.startswith('feat_') and col.endswith('_x')])
-                y_cols = sorted([col for col in df.columns if col.startswith('feat_') and col.endswith('_y')])
-                z_cols = sorted([col for col in df.columns if col.startswith('feat_') and col.endswith('_z')])
+                cols = _classify_cols(tuple(df.columns))
+                x_cols = sorted(cols['x'])
+                y_cols = sorted(cols['y'])
+                z_cols = sorted(cols['z'])
                 
                 num_frames = len(df)
                 num_landmarks = len(x_cols)
@@ -551,20 +571,19 @@ class StreamlitInterface:
                 st.info("Waiting for experiment selection...")
         
         # Show data preview for selected files
-        if hasattr(st.session_state, 'selected_read_files') and st.session_state.selected_read_files:
+        if st.session_state.get('selected_read_files'):
             with st.expander("Preview Selected Data", expanded=True):
                 for file in st.session_state.selected_read_files:
                     st.markdown(f"#### {file.name}")
                     try:
-                        df = pd.read_csv(file)
+                        df = _read_landmark_csv(file)
                         col1, col2, col3 = st.columns(3)
                         with col1:
                             st.metric("Rows (Frames)", len(df))
                         with col2:
                             st.metric("Columns", len(df.columns))
                         with col3:
-                            coord_cols = [col for col in df.columns if col.startswith('feat_') and col.endswith(('_x', '_y', '_z'))]
-                            num_landmarks = len(coord_cols) // 3
+                            num_landmarks = df.attrs.get('num_landmarks', 0)
                             st.metric("Facial Landmarks", num_landmarks)
                         
                         # Show first few rows
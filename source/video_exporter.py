@@ -6,21 +6,119 @@ Focuses on "just works" approach instead of overwhelming options.
 
 import os
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import numpy as np
 import cv2
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from fast_render import render_points, to_bgr8
+from video_writers import CODECS, FallbackVideoWriter
+
+
+def _init_render_worker():
+    """Use the non-interactive Agg backend in render workers."""
+    plt.switch_backend('Agg')
+
+
+# Rendered figure size in inches; pixels are this times the export DPI
+FIGSIZE = (12, 9)
+
+# Above this many points a frame skips matplotlib for the NumPy rasterizer
+RASTER_THRESHOLD = 200_000
+
+# Per-process figure reused across frames, keyed on the axis bounds
+_figure_cache = {}
+
+# Per-process attachments to the exporter's shared frame blocks
+_frame_blocks = {}
+
+
+def _frame_size(dpi):
+    """Frame (width, height) in pixels at the given DPI."""
+    return FIGSIZE[0] * dpi, FIGSIZE[1] * dpi
+
+
+def _shared_frame(shm_name, frame_size):
+    """Return a BGR image view over a shared frame block, attaching once."""
+    if shm_name not in _frame_blocks:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        view = np.ndarray((frame_size[1], frame_size[0], 3), dtype=np.uint8, buffer=shm.buf)
+        _frame_blocks[shm_name] = (shm, view)
+    return _frame_blocks[shm_name][1]
+
+
+def _get_figure(bounds, dpi):
+    """Return this process's (fig, ax, scatter, title), built once per bounds."""
+    key = (dpi,) + tuple(map(tuple, (bounds['xlim'], bounds['ylim'], bounds['zlim'])))
+    if key not in _figure_cache:
+        for fig, _, _, _ in _figure_cache.values():
+            plt.close(fig)
+        _figure_cache.clear()
+        
+        # Clean matplotlib rendering (no emoji to prevent stalling)
+        fig = plt.figure(figsize=FIGSIZE, facecolor='black', dpi=dpi)
+        # Fixed margins replace the per-frame tight bounding-box pass
+        fig.subplots_adjust(left=0.05, right=0.95, bottom=0.05, top=0.92)
+        ax = fig.add_subplot(111, projection='3d', facecolor='black')
+        scatter = ax.scatter([], [], [], s=3, alpha=0.8, edgecolors='none')
+        
+        # Clean styling (NO emoji characters anywhere)
+        ax.set_xlabel('X', color='white', fontsize=12)
+        ax.set_ylabel('Y', color='white', fontsize=12)
+        ax.set_zlabel('Z', color='white', fontsize=12)
+        ax.tick_params(colors='white', labelsize=10)
+        title = ax.set_title('', color='white', fontsize=14, pad=20)
+        
+        # Apply consistent bounds
+        ax.set_xlim(bounds['xlim'])
+        ax.set_ylim(bounds['ylim'])
+        ax.set_zlim(bounds['zlim'])
+        _figure_cache[key] = (fig, ax, scatter, title)
+    return _figure_cache[key]
+
+
+def _render_frame(args):
+    """Render a single frame into a shared frame block.
+    
+    Module-level so it can be pickled into worker processes. Only the
+    scatter data and title change between frames; the figure is reused.
+    Pixels go straight into shared memory, so only the frame number is
+    sent back to the encoder.
+    """
+    frame_data, frame_num, total_frames, bounds, shm_name, dpi = args
+    points = frame_data['points']
+    colors = frame_data['colors']
+    frame_size = _frame_size(dpi)
+    out = _shared_frame(shm_name, frame_size)
+    
+    if colors is None:
+        # Same per-frame normalization scatter(c=z, cmap='viridis') applies
+        z = points[:, 2]
+        colors = plt.cm.viridis((z - z.min()) / (np.ptp(z) or 1))
+    label = f'Frame {frame_num+1}/{total_frames} | {len(points)} points'
+    
+    if len(points) > RASTER_THRESHOLD:
+        out[:] = render_points(points, colors, bounds, frame_size, title=label)
+        return frame_num
+    
+    fig, ax, scatter, title = _get_figure(bounds, dpi)
+    scatter._offsets3d = (points[:, 0], points[:, 1], points[:, 2])
+    scatter.set_facecolor(colors)
+    title.set_text(label)
+    
+    # Hand the canvas pixels straight to the encoder - no PNG round-trip
+    fig.canvas.draw()
+    cv2.cvtColor(np.asarray(fig.canvas.buffer_rgba()), cv2.COLOR_RGBA2BGR, dst=out)
+    return frame_num
 
 
 class VideoExporter:
     """Simplified video exporter with automatic codec fallback."""
     
     # Simplified codec list - try best first, fallback automatically
-    CODECS = [
-        ('mp4v', '.mp4'),  # Most compatible
-        ('XVID', '.avi'),  # Fallback
-        ('MJPG', '.avi'),  # Last resort
-    ]
+    CODECS = CODECS
     
     def __init__(self, progress_callback=None):
         """Initialize exporter with optional progress callback."""
@@ -32,135 +130,114 @@ class VideoExporter:
         if self.progress_callback:
             self.progress_callback(message)
     
-    def export_video(self, frames_data, fps=10):
-        """Export animation as video - simplified with auto-fallback."""
+    def export_video(self, frames_data, fps=10, dpi=100):
+        """Export animation as video - simplified with auto-fallback.
+        
+        Lower ``dpi`` renders smaller frames: 80 DPI gives 960x720, about a
+        third fewer pixels to draw and encode than the default 1200x900.
+        """
         try:
             self.update_status("Starting video export...")
+            # H.264 with 4:2:0 chroma needs even frame dimensions
+            dpi = max(2, int(dpi) // 2 * 2)
+            frame_size = _frame_size(dpi)
             
             # Create temp directory
             temp_dir = tempfile.mkdtemp(prefix="video_export_")
-            frame_paths = []
             
-            # Pre-calculate bounds for consistency
-            all_points = np.vstack([f['points'] for f in frames_data])
-            max_range = np.max(np.ptp(all_points, axis=0)) / 2 * 1.1
-            mid = np.mean(all_points, axis=0)
+            # Pre-calculate bounds for consistency - reduced frame by frame so
+            # the whole animation is never stacked into one array
+            lo = np.full(3, np.inf)
+            hi = np.full(3, -np.inf)
+            total = np.zeros(3)
+            count = 0
+            for f in frames_data:
+                points = f['points']
+                np.minimum(lo, points.min(axis=0), out=lo)
+                np.maximum(hi, points.max(axis=0), out=hi)
+                total += points.sum(axis=0)
+                count += len(points)
+            max_range = np.max(hi - lo) / 2 * 1.1
+            mid = total / count
             bounds = {
                 'xlim': [mid[0] - max_range, mid[0] + max_range],
                 'ylim': [mid[1] - max_range, mid[1] + max_range],
                 'zlim': [mid[2] - max_range, mid[2] + max_range]
             }
             
-            # Render frames
-            total_frames = len(frames_data)
-            for i, frame_data in enumerate(frames_data):
-                progress = (i + 1) / total_frames
-                self.update_status(f"Rendering frame {i+1}/{total_frames} ({progress*100:.0f}%)")
-                
-                frame_path = self._render_frame(frame_data, i, total_frames, bounds, temp_dir)
-                frame_paths.append(frame_path)
+            # Open the writer up front so frames stream straight into it; if
+            # a codec fails mid-export the frames are rendered again into the
+            # next one instead of being spooled to disk on every export
+            video_writer = FallbackVideoWriter(
+                os.path.join(temp_dir, "animation"), frame_size, fps, self.CODECS,
+                self.update_status, rerender=lambda: self._render_frames(frames_data, bounds, dpi))
             
-            # Create video with automatic codec fallback
-            self.update_status("Encoding video...")
-            video_path = self._create_video(frame_paths, fps, temp_dir)
+            try:
+                for frame in self._render_frames(frames_data, bounds, dpi):
+                    video_writer.write(frame)
+            except BaseException:
+                video_writer.close()
+                raise
             
-            if video_path:
-                file_size = os.path.getsize(video_path)
-                self.update_status(f"Export complete! ({file_size / (1024*1024):.1f} MB)")
-                return video_path
-            else:
-                raise RuntimeError("All video codecs failed")
+            video_path = video_writer.release()
+            file_size = os.path.getsize(video_path)
+            self.update_status(f"Export complete! ({file_size / (1024*1024):.1f} MB)")
+            return video_path
                 
         except Exception as e:
             self.update_status(f"Export failed: {str(e)}")
             raise e
     
-    def _render_frame(self, frame_data, frame_num, total_frames, bounds, temp_dir):
-        """Render a single frame to PNG."""
-        points = frame_data['points']
-        colors = frame_data['colors']
-        
-        # Clean matplotlib rendering (no emoji to prevent stalling)
-        fig = plt.figure(figsize=(12, 9), facecolor='black', dpi=100)
-        ax = fig.add_subplot(111, projection='3d', facecolor='black')
-        
-        if colors is not None:
-            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                      c=colors, s=3, alpha=0.8, edgecolors='none')
-        else:
-            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                      c=points[:, 2], cmap='viridis', s=3, alpha=0.8, edgecolors='none')
-        
-        # Clean styling (NO emoji characters anywhere)
-        ax.set_xlabel('X', color='white', fontsize=12)
-        ax.set_ylabel('Y', color='white', fontsize=12)
-        ax.set_zlabel('Z', color='white', fontsize=12)
-        ax.tick_params(colors='white', labelsize=10)
-        ax.set_title(f'Frame {frame_num+1}/{total_frames} | {len(points)} points', 
-                   color='white', fontsize=14, pad=20)
-        
-        # Apply consistent bounds
-        ax.set_xlim(bounds['xlim'])
-        ax.set_ylim(bounds['ylim'])
-        ax.set_zlim(bounds['zlim'])
-        
-        # Save frame
-        frame_path = os.path.join(temp_dir, f"frame_{frame_num:04d}.png")
-        plt.savefig(frame_path, dpi=100, bbox_inches='tight', 
-                  facecolor='black', edgecolor='none', format='png')
-        plt.close()
-        
-        # Verify frame was created properly
-        if not os.path.exists(frame_path) or os.path.getsize(frame_path) < 1000:
-            raise ValueError(f"Frame {frame_num+1} failed to render properly")
-        
-        return frame_path
-    
-    def _create_video(self, frame_paths, fps, temp_dir):
-        """Create video with automatic codec fallback."""
-        if not frame_paths:
-            raise ValueError("No frames to encode")
+    def _render_frames(self, frames_data, bounds, dpi):
+        """Yield the rendered BGR frames in order.
         
-        # Get video dimensions from first frame
-        first_frame = cv2.imread(frame_paths[0])
-        if first_frame is None:
-            raise ValueError("Could not read first frame")
+        Rendering runs in parallel - matplotlib rendering is CPU-bound.
+        Workers draw into a ring of shared blocks that are drained in frame
+        order, so pixels never cross a pipe. Each yielded frame is a view
+        into the ring and is only valid until the next one is requested.
+        """
+        total_frames = len(frames_data)
+        workers = os.cpu_count() or 1
+        width, height = _frame_size(dpi)
+        ring = [shared_memory.SharedMemory(create=True, size=width * height * 3)
+                for _ in range(min(2 * workers, total_frames))]
+        views = {shm.name: np.ndarray((height, width, 3), dtype=np.uint8, buffer=shm.buf)
+                 for shm in ring}
+        free = deque(ring)
+        pending = deque()
         
-        height, width, layers = first_frame.shape
+        def next_frame():
+            shm, future = pending.popleft()
+            i = future.result()
+            progress = (i + 1) / total_frames
+            self.update_status(f"Rendering frame {i+1}/{total_frames} ({progress*100:.0f}%)")
+            return shm
         
-        # Try codecs in order until one works
-        for codec, ext in self.CODECS:
-            self.update_status(f"Trying {codec} codec...")
-            
-            try:
-                video_path = os.path.join(temp_dir, f"animation{ext}")
-                fourcc = cv2.VideoWriter_fourcc(*codec)
-                video_writer = cv2.VideoWriter(video_path, fourcc, fps, (width, height))
-                
-                if not video_writer.isOpened():
-                    video_writer.release()
-                    continue
-                
-                # Write all frames
-                for frame_path in frame_paths:
-                    frame = cv2.imread(frame_path)
-                    if frame is not None:
-                        video_writer.write(frame)
-                    else:
-                        video_writer.release()
-                        raise ValueError(f"Could not read frame: {frame_path}")
-                
-                video_writer.release()
-                
-                # Verify the video file
-                if os.path.exists(video_path) and os.path.getsize(video_path) > 5000:
-                    return video_path
-                    
-            except Exception:
-                continue
-        
-        # If we get here, all codecs failed
-        return None
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as executor:
+                for i, f in enumerate(frames_data):
+                    if not free:
+                        shm = next_frame()
+                        yield views[shm.name]
+                        free.append(shm)
+                    shm = free.popleft()
+                    colors = f['colors']
+                    if colors is not None and len(f['points']) > RASTER_THRESHOLD:
+                        # Rasterized frames take uint8 BGR - converted once here,
+                        # and an eighth the size of float64 to ship to a worker
+                        colors = to_bgr8(colors)
+                    job = ({'points': f['points'], 'colors': colors},
+                           i, total_frames, bounds, shm.name, dpi)
+                    pending.append((shm, executor.submit(_render_frame, job)))
+                while pending:
+                    shm = next_frame()
+                    yield views[shm.name]
+                    free.append(shm)
+        finally:
+            views.clear()
+            for shm in ring:
+                shm.close()
+                shm.unlink()
     
     @staticmethod
     def get_export_info():
@@ -174,7 +251,7 @@ class VideoExporter:
         }
 
 
-def create_simple_export(frames_data, fps=10, progress_callback=None):
+def create_simple_export(frames_data, fps=10, progress_callback=None, dpi=100):
     """Simple function interface for video export."""
     exporter = VideoExporter(progress_callback)
-    return exporter.export_video(frames_data, fps) 
\ No newline at end of file
+    return exporter.export_video(frames_data, fps, dpi=dpi) 
\ No newline at end of file
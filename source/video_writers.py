@@ -0,0 +1,261 @@
+"""Video Writers Module
+
+Encoder backends shared by the video exporters, with automatic codec
+fallback. Every writer exposes the cv2.VideoWriter calls the exporters use.
+"""
+
+import os
+import functools
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+import cv2
+
+
+# Codecs in preference order - try best first, fallback automatically
+CODECS = [
+    ('cudacodec_h264', '.mp4'),  # NVENC hardware encoder, CUDA builds only
+    ('ffmpeg_x264', '.mp4'),  # x264 ultrafast via the ffmpeg binary
+    ('mp4v', '.mp4'),  # Most compatible
+    ('XVID', '.avi'),  # Fallback
+    ('MJPG', '.avi'),  # Last resort
+]
+
+# Encoded files smaller than this are treated as a failed encode
+MIN_VIDEO_BYTES = 5000
+
+# Codecs that failed in this process; skipped on later exports
+_unavailable_codecs = set()
+
+# What a backend raises when it cannot take a frame or finish the file
+_ENCODER_ERRORS = (OSError, cv2.error, subprocess.SubprocessError)
+
+
+def _cuda_encoder_available():
+    """True when OpenCV was built with cudacodec and sees a CUDA device."""
+    return hasattr(cv2, 'cudacodec') and cv2.cuda.getCudaEnabledDeviceCount() > 0
+
+
+class _CudaVideoWriter:
+    """NVENC H.264 writer exposing the cv2.VideoWriter calls the exporter uses."""
+    
+    def __init__(self, path, frame_size, fps):
+        self._writer = cv2.cudacodec.createVideoWriter(path, frame_size, cv2.cudacodec.H264, fps)
+        self._frame = cv2.cuda_GpuMat()
+    
+    def isOpened(self):
+        return True
+    
+    def write(self, frame):
+        # One reused device buffer; encoding runs on the GPU's NVENC block
+        self._frame.upload(frame)
+        self._writer.write(self._frame)
+    
+    def release(self):
+        self._writer.release()
+
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_x264_available():
+    """True when an ffmpeg binary with the libx264 encoder is on PATH."""
+    if not shutil.which('ffmpeg'):
+        return False
+    try:
+        encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                  capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return 'libx264' in encoders
+
+
+class _FfmpegVideoWriter:
+    """x264 writer piping raw BGR frames into ffmpeg's stdin.
+    
+    The ultrafast preset encodes several times faster than OpenCV's mp4v
+    and produces H.264 that browsers play directly. A dead encoder raises
+    BrokenPipeError on write, and a non-zero exit raises on release.
+    """
+    
+    def __init__(self, path, frame_size, fps):
+        width, height = frame_size
+        self._proc = subprocess.Popen(
+            ['ffmpeg', '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', str(fps),
+             '-i', '-', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23',
+             '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE
+        )
+    
+    def isOpened(self):
+        return self._proc.poll() is None
+    
+    def write(self, frame):
+        # The frame buffer is contiguous, so it goes to the pipe without a copy
+        self._proc.stdin.write(memoryview(frame))
+    
+    def release(self):
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self._proc.wait() != 0:
+            raise subprocess.CalledProcessError(self._proc.returncode, 'ffmpeg')
+
+
+def _open_codec(codec, path, frame_size, fps):
+    """Open one codec's writer, or return None if it is unavailable."""
+    if codec == 'cudacodec_h264':
+        if _cuda_encoder_available():
+            try:
+                return _CudaVideoWriter(path, frame_size, fps)
+            except cv2.error:
+                pass
+        return None
+    if codec == 'ffmpeg_x264':
+        if _ffmpeg_x264_available():
+            return _FfmpegVideoWriter(path, frame_size, fps)
+        return None
+    
+    fourcc = cv2.VideoWriter_fourcc(*codec)
+    video_writer = cv2.VideoWriter(path, fourcc, fps, frame_size)
+    if video_writer.isOpened():
+        return video_writer
+    video_writer.release()
+    return None
+
+
+class FallbackVideoWriter:
+    """Video writer that moves on to the next codec when an encode fails.
+    
+    Frames are streamed into the first codec that opens. If that codec
+    breaks mid-stream, fails to finish, or leaves a near-empty file, it is
+    marked unavailable for the rest of the process and the frames are
+    written again into the next codec.
+    
+    Pass ``rerender``, a callable returning a fresh iterable of the same
+    frames, and a fallback renders them again - failures are rare, so the
+    common path pays nothing. Without it, frames are also spooled raw to a
+    temporary file for replay, but only while another codec is left to
+    fall back to.
+    
+    The output goes to ``base_path`` plus the codec's extension.
+    """
+    
+    def __init__(self, base_path, frame_size, fps, codecs=CODECS, status=None,
+                 rerender=None):
+        self.base_path = base_path
+        self.frame_size = frame_size
+        self.fps = fps
+        self.codec = None
+        self.path = None
+        self._codecs = list(codecs)
+        self._status = status
+        self._rerender = rerender
+        self._writer = None
+        self._spool = None
+        self._count = 0
+        if not self._next_codec():
+            raise RuntimeError("All video codecs failed")
+        if rerender is None and any(codec not in _unavailable_codecs
+                                    for codec, _ in self._codecs):
+            self._spool = tempfile.TemporaryFile()
+    
+    def _next_codec(self):
+        """Open the next codec not known to fail; False when none are left."""
+        while self._codecs:
+            codec, ext = self._codecs.pop(0)
+            if codec in _unavailable_codecs:
+                continue
+            if self._status:
+                self._status(f"Trying {codec} codec...")
+            
+            path = self.base_path + ext
+            writer = _open_codec(codec, path, self.frame_size, self.fps)
+            if writer is not None:
+                self.codec, self.path, self._writer = codec, path, writer
+                return True
+            _unavailable_codecs.add(codec)
+        return False
+    
+    def _drop_codec(self):
+        """Mark the current codec failed and shut its writer down."""
+        _unavailable_codecs.add(self.codec)
+        writer, self._writer = self._writer, None
+        try:
+            writer.release()
+        except _ENCODER_ERRORS:
+            pass
+    
+    def write(self, frame):
+        frame = np.ascontiguousarray(frame)
+        if self._spool is not None:
+            self._spool.write(memoryview(frame))
+        self._count += 1
+        if self._writer is None:
+            return
+        try:
+            self._writer.write(frame)
+        except _ENCODER_ERRORS:
+            self._drop_codec()
+    
+    def _finish(self):
+        """Release the current writer; True if it left a usable video."""
+        writer, self._writer = self._writer, None
+        try:
+            writer.release()
+        except _ENCODER_ERRORS:
+            ok = False
+        else:
+            ok = os.path.exists(self.path) and os.path.getsize(self.path) > MIN_VIDEO_BYTES
+        if not ok:
+            _unavailable_codecs.add(self.codec)
+        return ok
+    
+    def _replay_frames(self):
+        """The frames written so far, rendered again or read from the spool."""
+        if self._rerender is not None:
+            return self._rerender()
+        self._spool.flush()
+        width, height = self.frame_size
+        return np.memmap(self._spool, dtype=np.uint8, mode='r',
+                         shape=(self._count, height, width, 3))
+    
+    def _replay(self):
+        """Write every frame again into the current writer."""
+        frames = self._replay_frames()
+        try:
+            for frame in frames:
+                self._writer.write(np.ascontiguousarray(frame))
+        except _ENCODER_ERRORS:
+            self._drop_codec()
+        finally:
+            del frames
+    
+    def release(self):
+        """Finish the video and return its path, falling back codec by codec."""
+        try:
+            while True:
+                if self._writer is not None and self._finish():
+                    return self.path
+                replayable = self._rerender is not None or self._spool is not None
+                if not self._count or not replayable or not self._next_codec():
+                    raise RuntimeError("All video codecs failed")
+                self._replay()
+        finally:
+            self._close_spool()
+    
+    def _close_spool(self):
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+    
+    def close(self):
+        """Abandon the export: stop the encoder and drop any spooled frames."""
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            try:
+                writer.release()
+            except _ENCODER_ERRORS:
+                pass
+        self._close_spool()
@@ -9,23 +9,39 @@ import open3d as o3d
 import threading
 import time
 import sys
+import os
 import ctypes
+import hashlib
+import tempfile
+import select
+from concurrent.futures import ThreadPoolExecutor
 
 
 class ViewerCore:
     """Core viewer functionality."""
     
+    # Terminal input read past the last returned command
+    _stdin_pending = ""
+    
     @staticmethod
-    def create_point_cloud(points, colors=None):
-        """Convert numpy arrays to Open3D point cloud."""
+    def create_point_cloud(points, colors=None, estimate_normals=False):
+        """Convert numpy arrays to Open3D point cloud.
+        
+        Normals need a KD-tree neighbour search per cloud and plain point
+        rendering doesn't use them, so they are only estimated on request.
+        """
         pcd = o3d.geometry.PointCloud()
-        pcd.points = o3d.utility.Vector3dVector(points.astype(np.float64))
+        # Legacy geometry stores float64; convert only when the input isn't
+        # already float64, and clip colors in the converted copy
+        pcd.points = o3d.utility.Vector3dVector(np.asarray(points, dtype=np.float64))
         
         if colors is not None:
-            colors = np.clip(colors, 0, 1)
-            pcd.colors = o3d.utility.Vector3dVector(colors.astype(np.float64))
+            colors = np.array(colors, dtype=np.float64)
+            np.clip(colors, 0, 1, out=colors)
+            pcd.colors = o3d.utility.Vector3dVector(colors)
         
-        pcd.estimate_normals()
+        if estimate_normals:
+            pcd.estimate_normals(search_param=o3d.geometry.KDTreeSearchParamHybrid(radius=0.1, max_nn=30))
         return pcd
     
     @staticmethod
@@ -65,6 +81,58 @@ class ViewerCore:
                 print(f"⚠️ Focus error: {e}")
         
         threading.Timer(delay, focus_window).start()
+    
+    @staticmethod
+    def read_command(prompt, should_stop, poll_interval=0.1):
+        """Read one line from the terminal, or None once should_stop() is true.
+        
+        Waits in the OS (select on POSIX, msvcrt polling on Windows) rather
+        than a blocking input(), so the control thread can notice the viewer
+        closing and exit. Raises EOFError when stdin is closed.
+        """
+        print(prompt, end="", flush=True)
+        
+        if sys.platform == "win32":
+            import msvcrt
+            chars = []
+            while not should_stop():
+                if not msvcrt.kbhit():
+                    time.sleep(poll_interval)
+                    continue
+                char = msvcrt.getwch()
+                if char in ("\r", "\n"):
+                    print()
+                    return "".join(chars)
+                if char == "\x03":
+                    raise KeyboardInterrupt
+                if char == "\b":
+                    if chars:
+                        chars.pop()
+                        print("\b \b", end="", flush=True)
+                    continue
+                chars.append(char)
+                print(char, end="", flush=True)
+            return None
+        
+        # Read the raw fd so no line can sit unseen in sys.stdin's buffer
+        # while select() waits; leftover text is kept for the next call
+        fd = sys.stdin.fileno()
+        pending = ViewerCore._stdin_pending
+        while "\n" not in pending:
+            if should_stop():
+                ViewerCore._stdin_pending = pending
+                return None
+            ready, _, _ = select.select([fd], [], [], poll_interval)
+            if ready:
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    ViewerCore._stdin_pending = ""
+                    if pending:
+                        return pending
+                    raise EOFError
+                pending += chunk.decode(errors="replace")
+        line, _, ViewerCore._stdin_pending = pending.partition("\n")
+        return line
 
 
 class InteractiveControls:
@@ -94,8 +162,10 @@ class InteractiveControls:
         
         while self.running:
             try:
-                cmd = input("\n> ").strip().lower()
-                self.handle_command(cmd)
+                cmd = ViewerCore.read_command("\n> ", lambda: not self.running)
+                if cmd is None:
+                    break
+                self.handle_command(cmd.strip().lower())
             except (EOFError, KeyboardInterrupt):
                 print("\n👋 Closing viewer...")
                 self.vis.close()
@@ -156,44 +226,105 @@ class AnimationViewer:
         self.is_playing = False
         self.frame_delay = 1.0 / fps
         self.vis = None
+        self.display = None
+        self.last_tick = 0.0
+        self.running = True
+        # Guards is_playing against the tick callback unregistering itself
+        self._playback_lock = threading.Lock()
     
     def load_frames(self):
         """Load all animation frames."""
         print("📂 Loading animation frames...")
         
-        for i, path in enumerate(self.frame_paths):
-            if i % 5 == 0:
-                print(f"   Frame {i+1}/{len(self.frame_paths)}")
-            
+        def load(path):
             try:
-                pcd = o3d.io.read_point_cloud(path)
-                if len(pcd.points) > 0:
+                return self.load_cached_frame(path), None
+            except Exception as e:
+                return None, e
+        
+        # File reads and NumPy I/O release the GIL, so threads overlap them
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            results = executor.map(load, self.frame_paths)
+            for i, (path, (pcd, error)) in enumerate(zip(self.frame_paths, results)):
+                if i % 5 == 0:
+                    print(f"   Frame {i+1}/{len(self.frame_paths)}")
+                
+                if error is not None:
+                    print(f"⚠️ Could not load {path}: {error}")
+                elif len(pcd.points) > 0:
                     self.frames.append(pcd)
                 else:
                     print(f"⚠️ Empty frame: {path}")
-            except Exception as e:
-                print(f"⚠️ Could not load {path}: {e}")
         
         if not self.frames:
             raise ValueError("No valid frames loaded")
         
         print(f"✅ Loaded {len(self.frames)} frames")
     
+    # Parsed frame arrays, keyed on each source file's path, size and mtime
+    FRAME_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                   'facemesh3d', 'frames')
+    
+    @classmethod
+    def load_cached_frame(cls, path):
+        """Read one frame, reusing a .npz copy of its arrays when current.
+        
+        The first read parses the file with Open3D and saves its points,
+        colors and normals under FRAME_CACHE_DIR; later runs load the raw
+        arrays instead of re-parsing. A cache entry that cannot be read is
+        ignored and the file is parsed again.
+        """
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        cache_path = os.path.join(cls.FRAME_CACHE_DIR,
+                                  hashlib.sha1(key.encode()).hexdigest() + ".npz")
+        try:
+            with np.load(cache_path) as arrays:
+                points, colors, normals = arrays['points'], arrays['colors'], arrays['normals']
+        except Exception:
+            pass  # Missing, partial or foreign entry - parse the file instead
+        else:
+            pcd = o3d.geometry.PointCloud()
+            pcd.points = o3d.utility.Vector3dVector(points)
+            if len(colors):
+                pcd.colors = o3d.utility.Vector3dVector(colors)
+            if len(normals):
+                pcd.normals = o3d.utility.Vector3dVector(normals)
+            return pcd
+        
+        pcd = o3d.io.read_point_cloud(path)
+        tmp_path = None
+        try:
+            os.makedirs(cls.FRAME_CACHE_DIR, exist_ok=True)
+            # Write beside the entry and rename, so readers (including other
+            # loader threads) never see a half-written file
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cls.FRAME_CACHE_DIR)
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, points=np.asarray(pcd.points), colors=np.asarray(pcd.colors),
+                         normals=np.asarray(pcd.normals))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Unwritable cache location - just skip the cache
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return pcd
+    
     def start_viewer(self):
         """Start the animation viewer."""
         self.vis = ViewerCore.setup_visualizer("Open3D Animation Viewer")
         
-        # Add first frame
-        self.vis.add_geometry(self.frames[self.current_frame])
+        # One display cloud for the whole run; frames are copied into it
+        self.display = o3d.geometry.PointCloud(self.frames[self.current_frame])
+        self.vis.add_geometry(self.display)
         
         # Configure for animation
         render_opt = self.vis.get_render_option()
         render_opt.background_color = np.array([0.05, 0.05, 0.2])
         render_opt.point_size = 2.5
         
-        # Start control and animation threads
+        # Controls run in a thread; playback is driven by the render loop,
+        # with the tick callback registered only while playing
         self.start_control_thread()
-        self.start_animation_thread()
         
         # Focus window
         ViewerCore.bring_window_to_front("Open3D Animation Viewer")
@@ -206,6 +337,7 @@ class AnimationViewer:
         
         # Run viewer
         self.vis.run()
+        self.running = False
         self.vis.destroy_window()
         print("✅ Animation viewer closed")
     
@@ -214,15 +346,19 @@ class AnimationViewer:
         def control_loop():
             print("\n🎮 Animation Controls: SPACE (play/pause), n/p (next/prev), q (quit)")
             
-            while True:
+            while self.running:
                 try:
-                    cmd = input(f"\n[{self.current_frame+1}/{len(self.frames)}] > ").strip().lower()
+                    cmd = ViewerCore.read_command(f"\n[{self.current_frame+1}/{len(self.frames)}] > ",
+                                                  lambda: not self.running)
+                    if cmd is None:
+                        break
+                    cmd = cmd.strip().lower()
                     
                     if cmd in ['q', 'quit']:
                         self.vis.close()
                         break
                     elif cmd in [' ', 'space']:
-                        self.is_playing = not self.is_playing
+                        self.toggle_playback()
                         status = "▶️ Playing" if self.is_playing else "⏸️ Paused"
                         print(status)
                     elif cmd in ['n', 'next']:
@@ -244,21 +380,40 @@ class AnimationViewer:
         
         threading.Thread(target=control_loop, daemon=True).start()
     
-    def start_animation_thread(self):
-        """Start animation playback thread."""
-        def animation_loop():
-            last_time = time.time()
-            
-            while True:
-                if self.is_playing:
-                    current_time = time.time()
-                    if current_time - last_time >= self.frame_delay:
-                        self.next_frame()
-                        last_time = current_time
-                
-                time.sleep(0.01)
+    def toggle_playback(self):
+        """Play or pause the animation.
+        
+        Playing registers on_animation_tick; pausing leaves it to the next
+        tick to unregister itself from the visualizer's own thread.
+        """
+        with self._playback_lock:
+            self.is_playing = not self.is_playing
+            if self.is_playing:
+                self.vis.register_animation_callback(self.on_animation_tick)
+    
+    def on_animation_tick(self, vis):
+        """Advance playback from the visualizer's own event loop.
+        
+        While a callback is registered, run() polls instead of waiting for
+        window events and redraws after every tick whatever it returns. So
+        once paused the callback unregisters itself, and between frames it
+        sleeps (at most ~1/30 s, to keep the window responsive) rather than
+        spinning. Returns True when a new frame was shown.
+        """
+        with self._playback_lock:
+            if not self.is_playing:
+                vis.register_animation_callback(None)
+                return False
         
-        threading.Thread(target=animation_loop, daemon=True).start()
+        remaining = self.frame_delay - (time.time() - self.last_tick)
+        if remaining > 0:
+            time.sleep(min(remaining, 1 / 30))
+            if remaining > 1 / 30:
+                return False
+        
+        self.last_tick = time.time()
+        self.next_frame()
+        return True
     
     def next_frame(self):
         """Go to next frame."""
@@ -271,31 +426,61 @@ class AnimationViewer:
         self.update_frame()
     
     def update_frame(self):
-        """Update displayed frame."""
-        self.vis.clear_geometries()
-        self.vis.add_geometry(self.frames[self.current_frame])
+        """Update displayed frame.
+        
+        Swaps the frame's data into the existing geometry so the renderer
+        refreshes its buffers in place instead of rebuilding them.
+        """
+        frame = self.frames[self.current_frame]
+        self.display.points = frame.points
+        self.display.colors = frame.colors
+        # Copied even when empty, so a frame without normals clears the
+        # previous frame's instead of being lit with them
+        self.display.normals = frame.normals
+        self.vis.update_geometry(self.display)
         self.vis.update_renderer()
 
 
+# Below this size JIT dispatch and warm-up outweigh the fused kernel
+JIT_MIN_POINTS = 50_000
+
+
+def _sample_kernels():
+    """Return the optional Numba sample kernels, or None without numba."""
+    try:
+        import sample_kernels
+    except ImportError:
+        return None
+    return sample_kernels
+
+
 def generate_sample_data(data_type="sphere", num_points=2000):
     """Generate sample point cloud data."""
-    if data_type == "sphere":
+    kernels = _sample_kernels() if num_points > JIT_MIN_POINTS else None
+    
+    if data_type == "sphere" and kernels is not None:
+        points = np.empty((num_points, 3))
+        colors = np.empty((num_points, 3))
+        kernels.gen_sphere(points, colors)
+    
+    elif data_type == "sphere":
         phi = np.random.uniform(0, 2*np.pi, num_points)
         costheta = np.random.uniform(-1, 1, num_points)
         u = np.random.uniform(0, 1, num_points)
         
-        theta = np.arccos(costheta)
         r = u ** (1/3)
         
-        x = r * np.sin(theta) * np.cos(phi)
-        y = r * np.sin(theta) * np.sin(phi)
-        z = r * np.cos(theta)
+        # sin(arccos(c)) = sqrt(1 - c^2) and cos(arccos(c)) = c
+        r_sin_theta = r * np.sqrt(1 - costheta * costheta)
+        x = r_sin_theta * np.cos(phi)
+        y = r_sin_theta * np.sin(phi)
+        z = r * costheta
         points = np.column_stack([x, y, z])
         
         colors = np.column_stack([
             (phi / (2*np.pi)),
-            (theta / np.pi),
-            np.ones_like(phi) * 0.8
+            (np.arccos(costheta) / np.pi),
+            np.full_like(phi, 0.8)
         ])
         
     elif data_type == "torus":
@@ -303,15 +488,20 @@ def generate_sample_data(data_type="sphere", num_points=2000):
         u = np.random.uniform(0, 2*np.pi, num_points)
         v = np.random.uniform(0, 2*np.pi, num_points)
         
-        x = (R + r * np.cos(v)) * np.cos(u)
-        y = (R + r * np.cos(v)) * np.sin(u)
-        z = r * np.sin(v)
+        # Each trig term is computed once and shared by points and colors
+        cos_u, sin_u = np.cos(u), np.sin(u)
+        cos_v, sin_v = np.cos(v), np.sin(v)
+        ring = R + r * cos_v
+        
+        x = ring * cos_u
+        y = ring * sin_u
+        z = r * sin_v
         points = np.column_stack([x, y, z])
         
         colors = np.column_stack([
-            (np.sin(u) + 1) / 2,
-            (np.cos(u) + 1) / 2,
-            (np.sin(v) + 1) / 2
+            (sin_u + 1) / 2,
+            (cos_u + 1) / 2,
+            (sin_v + 1) / 2
         ])
     
     else:  # Random or other
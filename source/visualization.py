@@ -6,17 +6,47 @@ Enhanced with proper camera orientation for facial landmark data.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import math
+from fast_render import render_points, view_matrix
+
+
+def _pyplot():
+    """Import pyplot and the 3D projection on first use.
+    
+    Bounds and plot-info helpers stay usable without paying for
+    matplotlib's backend setup at import time.
+    """
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 - registers '3d'
+    return plt
 
 
 class PointCloudVisualizer:
     """Handles matplotlib visualization for point cloud previews."""
     
+    # Thumbnails can't resolve individual points beyond roughly this many
+    THUMBNAIL_POINTS = 512
+    
+    # Plotting precision. float32 is plenty for matplotlib and halves the
+    # data it copies; Open3D geometry keeps float64 and is built from the
+    # caller's arrays, never from these plotting copies.
+    PLOT_DTYPE = np.float32
+    
+    def __init__(self):
+        # Figure, axes and scatter reused by create_animation_frame_plot;
+        # per instance, so separate sessions/threads never share a figure
+        self._frame_artists = None
+    
+    @staticmethod
+    def as_plot_points(points):
+        """Contiguous PLOT_DTYPE copy of points, or points itself if it already is one."""
+        return np.ascontiguousarray(points, dtype=PointCloudVisualizer.PLOT_DTYPE)
+    
     @staticmethod
     def create_preview_plot(points, colors=None, title_prefix="Preview"):
         """Create matplotlib preview plot for point cloud."""
+        plt = _pyplot()
+        points = PointCloudVisualizer.as_plot_points(points)
         fig = plt.figure(figsize=(10, 8))
         ax = fig.add_subplot(111, projection='3d')
         
@@ -33,11 +63,10 @@ class PointCloudVisualizer:
         ax.set_title(f'{title_prefix} ({len(points)} points)\nThis is the LIMITED matplotlib view')
         
         # Equal aspect ratio
-        max_range = np.max(np.ptp(points, axis=0)) / 2
-        mid = np.mean(points, axis=0)
-        ax.set_xlim(mid[0] - max_range, mid[0] + max_range)
-        ax.set_ylim(mid[1] - max_range, mid[1] + max_range)
-        ax.set_zlim(mid[2] - max_range, mid[2] + max_range)
+        bounds = PointCloudVisualizer.aggregate_bounds([{'points': points}])
+        ax.set_xlim(bounds['xlim'])
+        ax.set_ylim(bounds['ylim'])
+        ax.set_zlim(bounds['zlim'])
         
         # Fix orientation - proper front-facing view for facial data
         # elev=20 (slightly above), azim=30 (angled view), roll=0 (upright)
@@ -46,51 +75,70 @@ class PointCloudVisualizer:
         
         return fig
     
-    @staticmethod
-    def create_animation_frame_plot(frame_data, frame_idx, total_frames, bounds=None):
-        """Create plot for a single animation frame."""
-        points = frame_data['points']
+    def _get_frame_artists(self):
+        """Return this visualizer's animation frame figure, building it on first use.
+        
+        Rebuilt if a caller closed the previous figure.
+        """
+        plt = _pyplot()
+        artists = self._frame_artists
+        if artists is None or not plt.fignum_exists(artists[0].number):
+            # Rasterized: the scatter draws as one bitmap at this fixed dpi
+            fig = plt.figure(figsize=(12, 8), dpi=100)
+            ax = fig.add_subplot(111, projection='3d')
+            scatter = ax.scatter([], [], [], s=1, alpha=0.7, rasterized=True)
+            
+            ax.set_xlabel('X')
+            ax.set_ylabel('Y')
+            ax.set_zlabel('Z')
+            
+            # Fix orientation - proper front-facing view for facial data
+            # Changed to azim=30 for better depth perception while keeping face visible
+            ax.view_init(elev=20, azim=30, roll=0)
+            
+            artists = self._frame_artists = (fig, ax, scatter)
+        return artists
+    
+    def create_animation_frame_plot(self, frame_data, frame_idx, total_frames, bounds=None):
+        """Create plot for a single animation frame.
+        
+        Every call on the same visualizer returns its one figure with the
+        scatter data, title and limits updated, so stepping through an
+        animation skips building a new Figure and Axes3D per frame. Use a
+        separate PointCloudVisualizer where figures must stay independent.
+        """
+        points = PointCloudVisualizer.as_plot_points(frame_data['points'])
         colors = frame_data['colors']
         filename = frame_data['filename']
         
-        fig = plt.figure(figsize=(12, 8))
-        ax = fig.add_subplot(111, projection='3d')
+        fig, ax, scatter = self._get_frame_artists()
         
-        if colors is not None:
-            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                      c=colors, s=1, alpha=0.7)
-        else:
-            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                      c=points[:, 2], cmap='viridis', s=1, alpha=0.7)
+        if not bounds:
+            # Calculate bounds for this frame
+            bounds = PointCloudVisualizer.aggregate_bounds([frame_data])
+        
+        if colors is None:
+            # Animation-wide z range when the caller passed shared bounds
+            zrange = bounds.get('zrange')
+            if zrange is None:
+                zrange = (points[:, 2].min(), points[:, 2].max())
+            colors = PointCloudVisualizer.z_colors(points, zrange)
+        scatter._offsets3d = (points[:, 0], points[:, 1], points[:, 2])
+        scatter.set_facecolor(colors)
         
-        ax.set_xlabel('X')
-        ax.set_ylabel('Y')
-        ax.set_zlabel('Z')
         # Clean title without emoji to prevent matplotlib issues
         ax.set_title(f'Frame {frame_idx+1}/{total_frames}: {filename}\nAnimation Preview ({len(points)} points)')
         
-        # Apply bounds if provided
-        if bounds:
-            ax.set_xlim(bounds['xlim'])
-            ax.set_ylim(bounds['ylim'])
-            ax.set_zlim(bounds['zlim'])
-        else:
-            # Calculate bounds for this frame
-            max_range = np.max(np.ptp(points, axis=0)) / 2
-            mid = np.mean(points, axis=0)
-            ax.set_xlim(mid[0] - max_range, mid[0] + max_range)
-            ax.set_ylim(mid[1] - max_range, mid[1] + max_range)
-            ax.set_zlim(mid[2] - max_range, mid[2] + max_range)
-        
-        # Fix orientation - proper front-facing view for facial data
-        # Changed to azim=30 for better depth perception while keeping face visible
-        ax.view_init(elev=20, azim=30, roll=0)
+        ax.set_xlim(bounds['xlim'])
+        ax.set_ylim(bounds['ylim'])
+        ax.set_zlim(bounds['zlim'])
         
         return fig
     
     @staticmethod
     def create_animation_thumbnail_grid(frames_data, max_frames=16, grid_cols=4):
         """Create a grid of thumbnail plots for animation frames."""
+        plt = _pyplot()
         total_frames = len(frames_data)
         
         # Limit number of frames to display
@@ -107,59 +155,49 @@ class PointCloudVisualizer:
         grid_rows = math.ceil(num_frames / grid_cols)
         
         # Calculate consistent bounds for all frames
-        all_points = np.vstack([f['points'] for f in frames_data])
-        max_range = np.max(np.ptp(all_points, axis=0)) / 2 * 1.1
-        mid = np.mean(all_points, axis=0)
-        bounds = {
-            'xlim': [mid[0] - max_range, mid[0] + max_range],
-            'ylim': [mid[1] - max_range, mid[1] + max_range],
-            'zlim': [mid[2] - max_range, mid[2] + max_range]
-        }
+        bounds = PointCloudVisualizer.aggregate_bounds(frames_data, padding=1.1)
         
-        # Create figure with subplots
-        fig = plt.figure(figsize=(grid_cols * 3, grid_rows * 2.5))
-        fig.suptitle(f'Animation Overview: {total_frames} Frames Total', fontsize=14)
+        # Rasterize every thumbnail into one RGB grid image; 100 px per inch
+        # keeps the figure the size the 3D subplot grid used to be
+        tile_w, tile_h = 300, 250
+        view = view_matrix(elev=20, azim=30)
+        grid = np.full((grid_rows * tile_h, grid_cols * tile_w, 3), 255, dtype=np.uint8)
         
-        for i, (frame_data, frame_num) in enumerate(zip(display_frames, frame_numbers)):
-            ax = fig.add_subplot(grid_rows, grid_cols, i + 1, projection='3d')
-            
-            points = frame_data['points']
-            colors = frame_data['colors']
-            
-            # Smaller point size for thumbnails
-            if colors is not None:
-                ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                          c=colors, s=0.5, alpha=0.8, edgecolors='none')
-            else:
-                ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                          c=points[:, 2], cmap='viridis', s=0.5, alpha=0.8, edgecolors='none')
-            
-            # Apply consistent bounds
-            ax.set_xlim(bounds['xlim'])
-            ax.set_ylim(bounds['ylim'])
-            ax.set_zlim(bounds['zlim'])
-            
-            # Minimal labels for thumbnails
-            ax.set_title(f'Frame {frame_num + 1}', fontsize=10)
-            ax.set_xticks([])
-            ax.set_yticks([])
-            ax.set_zticks([])
-            
-            # Remove axis labels for clean look
-            ax.set_xlabel('')
-            ax.set_ylabel('')
-            ax.set_zlabel('')
-            
-            # Fix orientation for thumbnails - consistent view
-            # Changed to azim=30 for better depth perception while keeping face visible
-            ax.view_init(elev=20, azim=30, roll=0)
+        for i, frame_data in enumerate(display_frames):
+            tile = PointCloudVisualizer._render_thumbnail(frame_data, bounds, (tile_w, tile_h), view)
+            row, col = divmod(i, grid_cols)
+            # render_points draws BGR
+            grid[row * tile_h:(row + 1) * tile_h, col * tile_w:(col + 1) * tile_w] = tile[..., ::-1]
+        
+        # One image artist plus a label per tile, instead of an Axes3D each
+        fig = plt.figure(figsize=(grid_cols * 3, grid_rows * 2.5 + 0.5))
+        fig.suptitle(f'Animation Overview: {total_frames} Frames Total', fontsize=14)
+        ax = fig.add_axes([0, 0, 1, grid_rows * 2.5 / (grid_rows * 2.5 + 0.5)])
+        ax.imshow(grid)
+        ax.set_axis_off()
+        for i, frame_num in enumerate(frame_numbers):
+            row, col = divmod(i, grid_cols)
+            ax.text((col + 0.5) * tile_w, row * tile_h + 5, f'Frame {frame_num + 1}',
+                    fontsize=10, ha='center', va='top')
         
-        plt.tight_layout()
         return fig
     
+    @staticmethod
+    def _render_thumbnail(frame_data, bounds, tile_size, view):
+        """Render one BGR thumbnail tile from an LOD subsample of the frame."""
+        points, colors = PointCloudVisualizer.lod_subsample(
+            frame_data['points'], frame_data['colors'])
+        
+        # Height colors over the animation's shared z range
+        if colors is None:
+            colors = PointCloudVisualizer.z_colors(points, bounds['zrange'])
+        
+        return render_points(points, colors, bounds, tile_size, view=view, background=255)
+    
     @staticmethod
     def create_animation_strip(frames_data, max_frames=12):
         """Create a horizontal strip of animation frames."""
+        plt = _pyplot()
         total_frames = len(frames_data)
         
         # Sample frames if too many
@@ -174,31 +212,24 @@ class PointCloudVisualizer:
         num_frames = len(display_frames)
         
         # Calculate consistent bounds
-        all_points = np.vstack([f['points'] for f in frames_data])
-        max_range = np.max(np.ptp(all_points, axis=0)) / 2 * 1.1
-        mid = np.mean(all_points, axis=0)
-        bounds = {
-            'xlim': [mid[0] - max_range, mid[0] + max_range],
-            'ylim': [mid[1] - max_range, mid[1] + max_range],
-            'zlim': [mid[2] - max_range, mid[2] + max_range]
-        }
+        bounds = PointCloudVisualizer.aggregate_bounds(frames_data, padding=1.1)
         
         # Create horizontal strip
-        fig = plt.figure(figsize=(num_frames * 2, 3))
+        fig = plt.figure(figsize=(num_frames * 2, 3), dpi=100)
         fig.suptitle(f'Animation Timeline: {total_frames} Frames', fontsize=12)
         
         for i, (frame_data, frame_num) in enumerate(zip(display_frames, frame_numbers)):
             ax = fig.add_subplot(1, num_frames, i + 1, projection='3d')
             
-            points = frame_data['points']
-            colors = frame_data['colors']
+            points, colors = PointCloudVisualizer.lod_subsample(
+                frame_data['points'], frame_data['colors'])
             
-            if colors is not None:
-                ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                          c=colors, s=0.3, alpha=0.9, edgecolors='none')
-            else:
-                ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
-                          c=points[:, 2], cmap='viridis', s=0.3, alpha=0.9, edgecolors='none')
+            # Height colors over the animation's shared z range
+            if colors is None:
+                colors = PointCloudVisualizer.z_colors(points, bounds['zrange'])
+            
+            ax.scatter(points[:, 0], points[:, 1], points[:, 2], 
+                      c=colors, s=0.3, alpha=0.9, edgecolors='none', rasterized=True)
             
             # Apply bounds
             ax.set_xlim(bounds['xlim'])
@@ -222,18 +253,64 @@ class PointCloudVisualizer:
         return fig
     
     @staticmethod
-    def calculate_animation_bounds(frames_data):
-        """Calculate consistent bounds for animation frames."""
-        all_points = np.vstack([f['points'] for f in frames_data])
-        max_range = np.max(np.ptp(all_points, axis=0)) / 2
-        mid = np.mean(all_points, axis=0)
+    def lod_subsample(points, colors, target=None):
+        """Stride-sample a cloud down to about ``target`` points.
+        
+        A fixed stride keeps the same landmarks in every frame, so sampled
+        thumbnails stay consistent across an animation. Points come back
+        as plotting copies (see as_plot_points).
+        """
+        target = target or PointCloudVisualizer.THUMBNAIL_POINTS
+        if len(points) > target:
+            step = math.ceil(len(points) / target)
+            points = points[::step]
+            if colors is not None:
+                colors = colors[::step]
+        return PointCloudVisualizer.as_plot_points(points), colors
+    
+    @staticmethod
+    def z_colors(points, zrange):
+        """Viridis RGBA for each point's height over a fixed z range.
+        
+        Passing precomputed colors skips scatter's norm/colormap pass, and
+        one range for a whole animation keeps colors stable across frames.
+        """
+        plt = _pyplot()
+        zmin, zmax = zrange
+        return plt.cm.viridis((points[:, 2] - zmin) / ((zmax - zmin) or 1))
+    
+    @staticmethod
+    def aggregate_bounds(frames_data, padding=1.0):
+        """Cube bounds around all frames, reduced one frame at a time.
+        
+        Running min/max/sum avoid stacking every frame into one array.
+        ``padding`` scales the half-width of the cube.
+        """
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        total = np.zeros(3)
+        count = 0
+        for f in frames_data:
+            points = f['points']
+            np.minimum(lo, points.min(axis=0), out=lo)
+            np.maximum(hi, points.max(axis=0), out=hi)
+            total += points.sum(axis=0)
+            count += len(points)
         
+        max_range = np.max(hi - lo) / 2 * padding
+        mid = total / count
         return {
             'xlim': [mid[0] - max_range, mid[0] + max_range],
             'ylim': [mid[1] - max_range, mid[1] + max_range],
-            'zlim': [mid[2] - max_range, mid[2] + max_range]
+            'zlim': [mid[2] - max_range, mid[2] + max_range],
+            'zrange': [lo[2], hi[2]]
         }
     
+    @staticmethod
+    def calculate_animation_bounds(frames_data):
+        """Calculate consistent bounds for animation frames."""
+        return PointCloudVisualizer.aggregate_bounds(frames_data)
+    
     @staticmethod
     def get_plot_info():
         """Get information about matplotlib plotting capabilities."""
@@ -258,42 +335,39 @@ class PointCloudVisualizer:
     @staticmethod
     def create_orientation_comparison_plot(points, colors=None):
         """Create a comparison plot showing different orientations."""
+        plt = _pyplot()
+        points = PointCloudVisualizer.as_plot_points(points)
+        bounds = PointCloudVisualizer.aggregate_bounds([{'points': points}])
+        
+        # One height colormap pass shared by all three views
+        if colors is None:
+            colors = PointCloudVisualizer.z_colors(points, bounds['zrange'])
+        
         fig = plt.figure(figsize=(15, 5))
         
         # Original (problematic) view
         ax1 = fig.add_subplot(131, projection='3d')
-        if colors is not None:
-            ax1.scatter(points[:, 0], points[:, 1], points[:, 2], c=colors, s=1, alpha=0.7)
-        else:
-            ax1.scatter(points[:, 0], points[:, 1], points[:, 2], c=points[:, 2], cmap='viridis', s=1, alpha=0.7)
+        ax1.scatter(points[:, 0], points[:, 1], points[:, 2], c=colors, s=1, alpha=0.7)
         ax1.set_title('Original View\n(Often upside-down)')
         # Default matplotlib view (often problematic)
         
         # Fixed front view
         ax2 = fig.add_subplot(132, projection='3d')
-        if colors is not None:
-            ax2.scatter(points[:, 0], points[:, 1], points[:, 2], c=colors, s=1, alpha=0.7)
-        else:
-            ax2.scatter(points[:, 0], points[:, 1], points[:, 2], c=points[:, 2], cmap='viridis', s=1, alpha=0.7)
+        ax2.scatter(points[:, 0], points[:, 1], points[:, 2], c=colors, s=1, alpha=0.7)
         ax2.set_title('Fixed Front View\n(elev=20, azim=30)')
         ax2.view_init(elev=20, azim=30, roll=0)
         
         # Side view
         ax3 = fig.add_subplot(133, projection='3d')
-        if colors is not None:
-            ax3.scatter(points[:, 0], points[:, 1], points[:, 2], c=colors, s=1, alpha=0.7)
-        else:
-            ax3.scatter(points[:, 0], points[:, 1], points[:, 2], c=points[:, 2], cmap='viridis', s=1, alpha=0.7)
+        ax3.scatter(points[:, 0], points[:, 1], points[:, 2], c=colors, s=1, alpha=0.7)
         ax3.set_title('Side View\n(elev=0, azim=0)')
         ax3.view_init(elev=0, azim=0, roll=0)
         
         # Set consistent bounds for all
-        max_range = np.max(np.ptp(points, axis=0)) / 2
-        mid = np.mean(points, axis=0)
         for ax in [ax1, ax2, ax3]:
-            ax.set_xlim(mid[0] - max_range, mid[0] + max_range)
-            ax.set_ylim(mid[1] - max_range, mid[1] + max_range)
-            ax.set_zlim(mid[2] - max_range, mid[2] + max_range)
+            ax.set_xlim(bounds['xlim'])
+            ax.set_ylim(bounds['ylim'])
+            ax.set_zlim(bounds['zlim'])
         
         plt.tight_layout()
         return fig 
\ No newline at end of file